@@ -0,0 +1,63 @@
+"""Add indexes for hot filters and sorts
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+# (name, table, columns, partial index predicate)
+INDEXES = [
+    # Contribution listing: newest first, optionally filtered by status, sector or author
+    ('ix_contributions_created_at_id', 'contributions', ['created_at', 'id'], None),
+    ('ix_contributions_status_created_at_id', 'contributions', ['status', 'created_at', 'id'], None),
+    ('ix_contributions_sector_id_created_at_id', 'contributions', ['sector_id', 'created_at', 'id'], None),
+    ('ix_contributions_user_id_created_at_id', 'contributions', ['user_id', 'created_at', 'id'], None),
+    # Verification queue: only submitted contributions, oldest first
+    ('ix_contributions_pending_created_at_id', 'contributions', ['created_at', 'id'], "status = 'submitted'"),
+    ('ix_impact_records_contribution_id', 'impact_records', ['contribution_id', 'id'], None),
+    # Marketplace listing only shows active items
+    ('ix_marketplace_items_active_id', 'marketplace_items', ['id'], 'active'),
+    ('ix_purchases_buyer_id_id', 'purchases', ['buyer_id', 'id'], None),
+    ('ix_purchases_item_id', 'purchases', ['item_id'], None),
+    # Only pending transactions are polled for confirmation
+    ('ix_onchain_transactions_pending_created_at', 'onchain_transactions', ['created_at'], "status = 'pending'"),
+    ('ix_audit_logs_entity_entity_id', 'audit_logs', ['entity', 'entity_id'], None),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction; building
+    # concurrently keeps the tables writable on a live database
+    # if_not_exists (Alembic 1.12+) lets a re-run after a partial failure
+    # skip the indexes that were already built
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -1,23 +1,25 @@
 from typing import Dict, Any, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.core.rate_limit import RateLimitAlgorithm, rate_limited
 from app.core.security import create_access_token, generate_nonce
-from app.core.deps import get_db
-from app.db.models import User, UserRole
+from app.core.deps import get_db, get_nonce_store
+from app.core.nonce_store import NonceStore
+from app.db.queries import get_or_create_user
 from app.db.schemas import UserCreate, User as UserSchema, UserWithToken
-from app.services.web3client import web3_client
+from app.services.siwe_verifier import VerifierBusyError, siwe_verifier
 
 router = APIRouter()
 
-# Store nonces in memory (in production, use Redis)
-nonces: Dict[str, str] = {}
 
-
-@router.post("/nonce", response_model=Dict[str, str])
-async def get_nonce(wallet: str):
+@router.post("/nonce", response_model=Dict[str, str], dependencies=[Depends(rate_limited(20, 60))])
+async def get_nonce(
+    wallet: str,
+    nonce_store: NonceStore = Depends(get_nonce_store),
+):
     """Generate a nonce for SIWE authentication."""
     if not wallet or not wallet.startswith("0x"):
         raise HTTPException(
@@ -26,49 +28,59 @@ async def get_nonce(wallet: str):
         )
     
     nonce = generate_nonce()
-    nonces[wallet.lower()] = nonce
+    await nonce_store.put(wallet.lower(), nonce)
     
     return {"nonce": nonce}
 
 
-@router.post("/verify", response_model=UserWithToken)
+@router.post(
+    "/verify",
+    response_model=UserWithToken,
+    # Spread attempts evenly so a client can't burst through a window boundary
+    dependencies=[Depends(rate_limited(10, 60, algorithm=RateLimitAlgorithm.GCRA))],
+)
 async def verify_signature(
     wallet: str,
     message: str,
     signature: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
+    nonce_store: NonceStore = Depends(get_nonce_store),
 ):
     """Verify SIWE signature and create/login user."""
     wallet = wallet.lower()
     
     # Verify the signature
-    if not web3_client.verify_siwe_message(message, signature):
+    try:
+        valid = await siwe_verifier.verify(message, signature)
+    except VerifierBusyError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-in attempts, try again shortly",
+            headers={"Retry-After": "1"},
+        )
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid signature",
         )
     
-    # Check if the nonce is valid
-    stored_nonce = nonces.get(wallet)
+    # Check if the nonce is valid; it is consumed either way
+    stored_nonce = await nonce_store.pop(wallet)
     if not stored_nonce or stored_nonce not in message:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid nonce",
         )
     
-    # Clear the nonce
-    nonces.pop(wallet, None)
-    
     # Get or create user
-    user = db.query(User).filter(User.wallet == wallet).first()
-    if not user:
-        user = User(wallet=wallet, role=UserRole.USER)
-        db.add(user)
-        db.commit()
-        db.refresh(user)
+    user = await get_or_create_user(db, wallet)
+    await db.commit()
     
     # Create access token
-    access_token = create_access_token(subject=wallet)
+    access_token = create_access_token(
+        subject=wallet,
+        extra_claims={"uid": user.id, "role": user.role.value, "ver": user.token_version},
+    )
     
     return {
         **UserSchema.model_validate(user).model_dump(),
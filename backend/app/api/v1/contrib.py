@@ -1,49 +1,76 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status, UploadFile, File, Form
+from fastapi.responses import StreamingResponse
+from sqlalchemy import exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_db, get_current_user
-from app.db.models import Contribution, ContributionStatus, User, Sector, ContributionMetadata
+from app.core.deps import get_db, get_read_db, get_current_user, get_current_admin
+from app.core.pagination import paginate, set_next_cursor
+from app.core.rate_limit import rate_limited
+from app.core.ranges import parse_range
+from app.db.base import release_connection
+from app.db.models import (
+    Contribution, ContributionStatus, User, UserRole, Sector, ContributionMetadata,
+    MarketplaceItem, Purchase,
+)
+from app.db.queries import get_contribution_by_id, get_sector_by_id
 from app.db.schemas import (
     Contribution as ContributionSchema,
     ContributionCreate,
     ContributionUpdate,
     ContributionWithMetadata,
     ContributionMetadataBase as ContributionMetadataSchema,
+    ContributionImportResult,
 )
-from app.services.ipfs import ipfs_client
+from app.services.bulk_import import ContributionImporter, ImportFormat, detect_format, iter_records, iter_upload_lines
+from app.services.ipfs import UploadTooLargeError, ipfs_client
 
 router = APIRouter()
 
+# Newest first, with the id as a tiebreaker for cursor pagination
+CONTRIBUTION_SORT_KEYS = (Contribution.created_at, Contribution.id)
+
 
 @router.get("/", response_model=List[ContributionSchema])
 async def get_contributions(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     status: Optional[ContributionStatus] = None,
     sector_id: Optional[int] = None,
     user_id: Optional[int] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Get all contributions with optional filters."""
-    query = db.query(Contribution)
+    """Get all contributions with optional filters.
+
+    Pass the X-Next-Cursor header of a full page back as ``cursor`` to
+    fetch the following page without an OFFSET scan.
+    """
+    query = select(Contribution)
     
     if status:
-        query = query.filter(Contribution.status == status)
+        query = query.where(Contribution.status == status)
     
     if sector_id:
-        query = query.filter(Contribution.sector_id == sector_id)
+        query = query.where(Contribution.sector_id == sector_id)
     
     if user_id:
-        query = query.filter(Contribution.user_id == user_id)
+        query = query.where(Contribution.user_id == user_id)
     
-    contributions = query.order_by(desc(Contribution.created_at)).offset(skip).limit(limit).all()
+    result = await db.scalars(paginate(query, CONTRIBUTION_SORT_KEYS, skip, limit, cursor))
+    contributions = result.all()
+    set_next_cursor(response, contributions, CONTRIBUTION_SORT_KEYS, limit)
     return contributions
 
 
-@router.post("/", response_model=ContributionWithMetadata, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/",
+    response_model=ContributionWithMetadata,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limited(10, 60))],
+)
 async def create_contribution(
     title: str = Form(...),
     description: str = Form(...),
@@ -51,20 +78,28 @@ async def create_contribution(
     target_amount: float = Form(...),
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Create a new contribution with metadata and file upload to IPFS."""
     # Check if sector exists
-    sector = db.query(Sector).filter(Sector.id == sector_id).first()
+    sector = await get_sector_by_id(db, sector_id)
     if not sector:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Sector not found",
         )
     
-    # Upload file to IPFS
-    file_content = await file.read()
-    ipfs_hash = await ipfs_client.add_file(file_content)
+    # Don't hold a pooled connection while the file uploads
+    await release_connection(db)
+    
+    # Stream the file to IPFS without reading it into memory
+    try:
+        ipfs_hash = await ipfs_client.add_stream(file, file.filename)
+    except UploadTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e),
+        )
     
     # Create contribution
     contribution_data = {
@@ -77,21 +112,17 @@ async def create_contribution(
     }
     
     db_contribution = Contribution(**contribution_data)
-    db.add(db_contribution)
-    db.flush()  # Get ID without committing
     
-    # Create metadata
+    # Create metadata; the flush inserts both rows and RETURNING fills in the id
     metadata = ContributionMetadata(
-        contribution_id=db_contribution.id,
+        contribution=db_contribution,
         ipfs_hash=ipfs_hash,
         file_name=file.filename,
         file_type=file.content_type,
     )
-    db.add(metadata)
+    db.add(db_contribution)
     
-    db.commit()
-    db.refresh(db_contribution)
-    db.refresh(metadata)
+    await db.commit()
     
     # Return combined result
     return {
@@ -100,22 +131,37 @@ async def create_contribution(
     }
 
 
+@router.post("/import", response_model=ContributionImportResult)
+async def import_contributions(
+    file: UploadFile = File(...),
+    format: Optional[ImportFormat] = None,
+    current_user: User = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_db),
+):
+    """Bulk-import contributions from an NDJSON or CSV upload (admin only).
+
+    Rows are streamed from the upload, validated and inserted in batches;
+    invalid rows are skipped and reported by row number.
+    """
+    fmt = format or detect_format(file.filename)
+    importer = ContributionImporter(db)
+    return await importer.run(iter_records(iter_upload_lines(file), fmt))
+
+
 @router.get("/{contribution_id}", response_model=ContributionWithMetadata)
 async def get_contribution(
     contribution_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Get contribution by ID with its metadata."""
-    contribution = db.query(Contribution).filter(Contribution.id == contribution_id).first()
+    contribution = await get_contribution_by_id(db, contribution_id)
     if not contribution:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Contribution not found",
         )
     
-    metadata = db.query(ContributionMetadata).filter(
-        ContributionMetadata.contribution_id == contribution_id
-    ).first()
+    metadata = await db.get(ContributionMetadata, contribution_id)
     
     return {
         **ContributionSchema.model_validate(contribution).model_dump(),
@@ -123,15 +169,91 @@ async def get_contribution(
     }
 
 
+@router.get("/{contribution_id}/content")
+async def get_contribution_content(
+    contribution_id: int,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_range: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Stream a contribution's file from IPFS, honouring Range requests.
+
+    Premium content is only available to its author, admins and buyers.
+    """
+    contribution = await get_contribution_by_id(db, contribution_id)
+    if not contribution:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Contribution not found",
+        )
+    
+    if (
+        contribution.premium
+        and contribution.user_id != current_user.id
+        and current_user.role != UserRole.ADMIN
+        and not await db.scalar(
+            select(
+                exists()
+                .where(Purchase.buyer_id == current_user.id)
+                .where(Purchase.item_id == MarketplaceItem.id)
+                .where(MarketplaceItem.contribution_id == contribution_id)
+            )
+        )
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Purchase this contribution to access its content",
+        )
+    
+    # Don't hold a pooled connection while the file streams
+    await release_connection(db)
+    
+    cid = contribution.ipfs_cid
+    size = await ipfs_client.get_size(cid)
+    if size is None:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Content is not available from IPFS",
+        )
+    
+    # CIDs are immutable, so the CID is a strong validator
+    etag = f'"{cid}"'
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": etag,
+        "Cache-Control": "private, max-age=31536000, immutable",
+    }
+    
+    byte_range = parse_range(range_header, size) if if_range in (None, etag) else None
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(
+            ipfs_client.iter_file(cid),
+            media_type="application/octet-stream",
+            headers=headers,
+        )
+    
+    start, end = byte_range
+    headers["Content-Length"] = str(end - start + 1)
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return StreamingResponse(
+        ipfs_client.iter_file(cid, offset=start, length=end - start + 1),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type="application/octet-stream",
+        headers=headers,
+    )
+
+
 @router.put("/{contribution_id}", response_model=ContributionSchema)
 async def update_contribution(
     contribution_id: int,
     contribution_update: ContributionUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Update contribution (only by owner or admin)."""
-    contribution = db.query(Contribution).filter(Contribution.id == contribution_id).first()
+    contribution = await get_contribution_by_id(db, contribution_id)
     if not contribution:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -150,8 +272,7 @@ async def update_contribution(
         if key not in ["status"] or current_user.role == "ADMIN":  # Only admin can update status
             setattr(contribution, key, value)
     
-    db.commit()
-    db.refresh(contribution)
+    await db.commit()
     return contribution
 
 
@@ -159,10 +280,10 @@ async def update_contribution(
 async def delete_contribution(
     contribution_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Delete contribution (only by owner or admin)."""
-    contribution = db.query(Contribution).filter(Contribution.id == contribution_id).first()
+    contribution = await get_contribution_by_id(db, contribution_id)
     if not contribution:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -177,12 +298,10 @@ async def delete_contribution(
         )
     
     # Delete associated metadata
-    metadata = db.query(ContributionMetadata).filter(
-        ContributionMetadata.contribution_id == contribution_id
-    ).first()
+    metadata = await db.get(ContributionMetadata, contribution_id)
     if metadata:
-        db.delete(metadata)
+        await db.delete(metadata)
     
-    db.delete(contribution)
-    db.commit()
+    await db.delete(contribution)
+    await db.commit()
     return None
\ No newline at end of file
@@ -1,17 +1,21 @@
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_db, get_current_user, get_current_verifier
-from app.db.models import User, Contribution, ContributionStatus, ImpactRecord
+from app.core.deps import get_db, get_read_db, get_current_user, get_current_verifier
+from app.core.rate_limit import rate_limited
+from app.db.base import release_connection
+from app.db.models import User, Contribution, ContributionStatus, ImpactRecord, TokenDistribution
+from app.db.queries import get_contribution_by_id
 from app.db.schemas import (
     ImpactRecord as ImpactRecordSchema,
     ImpactRecordCreate,
     ImpactRecordUpdate,
-    TokenDistribution as TokenDistributionSchema,
 )
-from app.services.ipfs import ipfs_client
+from app.services.ipfs import UploadTooLargeError, ipfs_client
 from app.services.web3client import web3_client
 
 router = APIRouter()
@@ -22,30 +26,35 @@ async def get_impact_records(
     skip: int = 0,
     limit: int = 100,
     contribution_id: Optional[int] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get all impact records with optional filters."""
-    query = db.query(ImpactRecord)
+    query = select(ImpactRecord)
     
     if contribution_id:
-        query = query.filter(ImpactRecord.contribution_id == contribution_id)
+        query = query.where(ImpactRecord.contribution_id == contribution_id)
     
-    impact_records = query.offset(skip).limit(limit).all()
-    return impact_records
+    result = await db.scalars(query.offset(skip).limit(limit))
+    return result.all()
 
 
-@router.post("/", response_model=ImpactRecordSchema, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/",
+    response_model=ImpactRecordSchema,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limited(10, 60))],
+)
 async def create_impact_record(
     contribution_id: int = Form(...),
     description: str = Form(...),
     impact_value: float = Form(...),
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Create a new impact record with evidence upload to IPFS."""
     # Check if contribution exists and is approved
-    contribution = db.query(Contribution).filter(Contribution.id == contribution_id).first()
+    contribution = await get_contribution_by_id(db, contribution_id)
     if not contribution:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -65,9 +74,17 @@ async def create_impact_record(
             detail="Not authorized to add impact records to this contribution",
         )
     
-    # Upload evidence to IPFS
-    file_content = await file.read()
-    ipfs_hash = await ipfs_client.add_file(file_content)
+    # Don't hold a pooled connection while the evidence uploads
+    await release_connection(db)
+    
+    # Stream the evidence to IPFS without reading it into memory
+    try:
+        ipfs_hash = await ipfs_client.add_stream(file, file.filename)
+    except UploadTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e),
+        )
     
     # Create impact record
     impact_record_data = {
@@ -82,8 +99,7 @@ async def create_impact_record(
     
     db_impact_record = ImpactRecord(**impact_record_data)
     db.add(db_impact_record)
-    db.commit()
-    db.refresh(db_impact_record)
+    await db.commit()
     
     return db_impact_record
 
@@ -91,10 +107,10 @@ async def create_impact_record(
 @router.get("/{impact_id}", response_model=ImpactRecordSchema)
 async def get_impact_record(
     impact_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Get impact record by ID."""
-    impact_record = db.query(ImpactRecord).filter(ImpactRecord.id == impact_id).first()
+    impact_record = await db.get(ImpactRecord, impact_id)
     if not impact_record:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -109,10 +125,14 @@ async def verify_impact_record(
     impact_id: int,
     token_amount: float,
     current_user: User = Depends(get_current_verifier),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Verify an impact record and distribute tokens (verifier only)."""
-    impact_record = db.query(ImpactRecord).filter(ImpactRecord.id == impact_id).first()
+    impact_record = await db.get(
+        ImpactRecord,
+        impact_id,
+        options=[joinedload(ImpactRecord.contribution).joinedload(Contribution.user)],
+    )
     if not impact_record:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -129,11 +149,11 @@ async def verify_impact_record(
     contribution = impact_record.contribution
     user = contribution.user
     
-    # Update impact record
+    # Mark the record verified first; committing also releases the
+    # connection for the duration of the RPC call
     impact_record.verified = True
     impact_record.verifier_id = current_user.id
-    db.commit()
-    db.refresh(impact_record)
+    await db.commit()
     
     # Distribute tokens on blockchain
     try:
@@ -142,18 +162,18 @@ async def verify_impact_record(
             amount=token_amount,
             impact_id=impact_record.id,
         )
-        
-        # Create token distribution record
-        token_distribution = TokenDistributionSchema(
-            impact_record_id=impact_record.id,
-            amount=token_amount,
-            tx_hash=tx_hash,
-        )
-        
-        # In a real application, you would store the token distribution
-        # and monitor the transaction status
     except Exception as e:
         # Log the error but don't fail the API call
         print(f"Error distributing tokens on blockchain: {e}")
+        tx_hash = None
+    
+    # Record the completed distribution in a second short transaction
+    if tx_hash:
+        db.add(TokenDistribution(
+            contribution_id=contribution.id,
+            amount=token_amount,
+            tx_hash=tx_hash,
+        ))
+        await db.commit()
     
     return impact_record
\ No newline at end of file
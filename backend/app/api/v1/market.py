@@ -1,11 +1,14 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_db, get_current_user, get_current_admin
+from app.core.deps import get_db, get_read_db, get_current_user, get_current_admin
+from app.core.pagination import paginate, set_next_cursor
+from app.db.base import release_connection
 from app.db.models import User, MarketplaceItem, Purchase, TransactionStatus
+from app.db.queries import get_marketplace_item_by_id, update_returning
 from app.db.schemas import (
     MarketplaceItem as MarketplaceItemSchema,
     MarketplaceItemCreate,
@@ -17,21 +20,29 @@ from app.services.web3client import web3_client
 
 router = APIRouter()
 
+# Items and purchases have no timestamp; ids are assigned in creation order
+ITEM_SORT_KEYS = (MarketplaceItem.id,)
+PURCHASE_SORT_KEYS = (Purchase.id,)
+
 
 @router.get("/items", response_model=List[MarketplaceItemSchema])
 async def get_marketplace_items(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     active_only: bool = True,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get all marketplace items with optional filters."""
-    query = db.query(MarketplaceItem)
+    query = select(MarketplaceItem)
     
     if active_only:
-        query = query.filter(MarketplaceItem.active == True)
+        query = query.where(MarketplaceItem.active == True)
     
-    items = query.order_by(desc(MarketplaceItem.created_at)).offset(skip).limit(limit).all()
+    result = await db.scalars(paginate(query, ITEM_SORT_KEYS, skip, limit, cursor))
+    items = result.all()
+    set_next_cursor(response, items, ITEM_SORT_KEYS, limit)
     return items
 
 
@@ -39,23 +50,22 @@ async def get_marketplace_items(
 async def create_marketplace_item(
     item: MarketplaceItemCreate,
     current_user: User = Depends(get_current_admin),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Create a new marketplace item (admin only)."""
     db_item = MarketplaceItem(**item.model_dump(), active=True)
     db.add(db_item)
-    db.commit()
-    db.refresh(db_item)
+    await db.commit()
     return db_item
 
 
 @router.get("/items/{item_id}", response_model=MarketplaceItemSchema)
 async def get_marketplace_item(
     item_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Get marketplace item by ID."""
-    item = db.query(MarketplaceItem).filter(MarketplaceItem.id == item_id).first()
+    item = await get_marketplace_item_by_id(db, item_id)
     if not item:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -69,21 +79,19 @@ async def update_marketplace_item(
     item_id: int,
     item_update: MarketplaceItemUpdate,
     current_user: User = Depends(get_current_admin),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Update marketplace item (admin only)."""
-    db_item = db.query(MarketplaceItem).filter(MarketplaceItem.id == item_id).first()
+    db_item = await update_returning(
+        db, MarketplaceItem, item_id, item_update.model_dump(exclude_unset=True)
+    )
     if not db_item:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Marketplace item not found",
         )
     
-    for key, value in item_update.model_dump(exclude_unset=True).items():
-        setattr(db_item, key, value)
-    
-    db.commit()
-    db.refresh(db_item)
+    await db.commit()
     return db_item
 
 
@@ -91,10 +99,10 @@ async def update_marketplace_item(
 async def delete_marketplace_item(
     item_id: int,
     current_user: User = Depends(get_current_admin),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Delete marketplace item (admin only)."""
-    db_item = db.query(MarketplaceItem).filter(MarketplaceItem.id == item_id).first()
+    db_item = await get_marketplace_item_by_id(db, item_id)
     if not db_item:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -102,14 +110,14 @@ async def delete_marketplace_item(
         )
     
     # Check if item has purchases
-    if db_item.purchases:
+    if await db.scalar(select(exists().where(Purchase.item_id == item_id))):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot delete item with existing purchases",
         )
     
-    db.delete(db_item)
-    db.commit()
+    await db.delete(db_item)
+    await db.commit()
     return None
 
 
@@ -117,14 +125,14 @@ async def delete_marketplace_item(
 async def purchase_item(
     purchase: PurchaseCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Purchase an item from the marketplace."""
     # Check if item exists and is active
-    item = db.query(MarketplaceItem).filter(
+    item = await db.scalar(select(MarketplaceItem).where(
         MarketplaceItem.id == purchase.item_id,
         MarketplaceItem.active == True
-    ).first()
+    ))
     
     if not item:
         raise HTTPException(
@@ -132,6 +140,9 @@ async def purchase_item(
             detail="Marketplace item not found or inactive",
         )
     
+    # Don't hold a pooled connection during the RPC calls below
+    await release_connection(db)
+    
     # Check if user has enough tokens
     user_balance = await web3_client.get_token_balance(current_user.wallet)
     if user_balance < item.price:
@@ -149,7 +160,7 @@ async def purchase_item(
         status=TransactionStatus.PENDING,
     )
     db.add(db_purchase)
-    db.flush()  # Get ID without committing
+    await db.commit()  # Persist the pending purchase and release the connection
     
     # Process payment on blockchain
     try:
@@ -168,22 +179,25 @@ async def purchase_item(
         db_purchase.status = TransactionStatus.FAILED
         db_purchase.failure_reason = str(e)
     
-    db.commit()
-    db.refresh(db_purchase)
+    # Record the outcome in a second short transaction
+    await db.commit()
     return db_purchase
 
 
 @router.get("/purchases", response_model=List[PurchaseSchema])
 async def get_user_purchases(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Get all purchases for the current user."""
-    purchases = db.query(Purchase).filter(
-        Purchase.user_id == current_user.id
-    ).order_by(desc(Purchase.created_at)).offset(skip).limit(limit).all()
+    query = select(Purchase).where(Purchase.buyer_id == current_user.id)
+    result = await db.scalars(paginate(query, PURCHASE_SORT_KEYS, skip, limit, cursor))
+    purchases = result.all()
+    set_next_cursor(response, purchases, PURCHASE_SORT_KEYS, limit)
     
     return purchases
 
@@ -192,10 +206,10 @@ async def get_user_purchases(
 async def get_purchase(
     purchase_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Get purchase by ID (only for the owner or admin)."""
-    purchase = db.query(Purchase).filter(Purchase.id == purchase_id).first()
+    purchase = await db.get(Purchase, purchase_id)
     if not purchase:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,8 +1,22 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
-from app.api.v1 import auth, sectors, contrib, verify, impact, market, users
+from app.api.v1 import auth, sectors, contrib, verify, impact, market, users, system
+from app.core.config import settings
+from app.core.rate_limit import rate_limited, request_cost
 
-api_router = APIRouter()
+# One budget per client across the API; uploads spend more of it
+api_router = APIRouter(
+    dependencies=[
+        Depends(
+            rate_limited(
+                settings.RATE_LIMIT_API_TIMES,
+                settings.RATE_LIMIT_API_SECONDS,
+                cost=request_cost,
+                scope="api",
+            )
+        )
+    ]
+)
 
 # Include all routers
 api_router.include_router(auth.router, prefix="/auth", tags=["Authentication"])
@@ -11,4 +25,5 @@ api_router.include_router(sectors.router, prefix="/sectors", tags=["Sectors"])
 api_router.include_router(contrib.router, prefix="/contrib", tags=["Contributions"])
 api_router.include_router(verify.router, prefix="/verify", tags=["Verification"])
 api_router.include_router(impact.router, prefix="/impact", tags=["Impact"])
-api_router.include_router(market.router, prefix="/market", tags=["Marketplace"])
\ No newline at end of file
+api_router.include_router(market.router, prefix="/market", tags=["Marketplace"])
+api_router.include_router(system.router, prefix="/system", tags=["System"])
\ No newline at end of file
@@ -1,10 +1,13 @@
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import exists, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_db, get_current_user, get_current_admin
-from app.db.models import Sector, User
+from app.core.deps import get_db, get_read_db, get_current_user, get_current_admin
+from app.db.models import Contribution, Sector, User
+from app.db.queries import get_sector_by_id, update_returning
 from app.db.schemas import Sector as SectorSchema, SectorCreate, SectorUpdate
 
 router = APIRouter()
@@ -14,10 +17,11 @@ router = APIRouter()
 async def get_sectors(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get all sectors."""
-    sectors = db.query(Sector).offset(skip).limit(limit).all()
+    result = await db.scalars(select(Sector).offset(skip).limit(limit))
+    sectors = result.all()
     return sectors
 
 
@@ -25,31 +29,31 @@ async def get_sectors(
 async def create_sector(
     sector: SectorCreate,
     current_user: User = Depends(get_current_admin),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Create a new sector (admin only)."""
-    # Check if sector with same name already exists
-    existing_sector = db.query(Sector).filter(Sector.name == sector.name).first()
-    if existing_sector:
+    db_sector = Sector(**sector.model_dump())
+    db.add(db_sector)
+    
+    # The unique constraint on name rejects duplicates without a lookup
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Sector with this name already exists",
         )
-    
-    db_sector = Sector(**sector.model_dump())
-    db.add(db_sector)
-    db.commit()
-    db.refresh(db_sector)
     return db_sector
 
 
 @router.get("/{sector_id}", response_model=SectorSchema)
 async def get_sector(
     sector_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Get sector by ID."""
-    sector = db.query(Sector).filter(Sector.id == sector_id).first()
+    sector = await get_sector_by_id(db, sector_id)
     if not sector:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -63,30 +67,27 @@ async def update_sector(
     sector_id: int,
     sector_update: SectorUpdate,
     current_user: User = Depends(get_current_admin),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Update sector (admin only)."""
-    db_sector = db.query(Sector).filter(Sector.id == sector_id).first()
+    # Name conflicts are caught by the unique constraint on name
+    try:
+        db_sector = await update_returning(
+            db, Sector, sector_id, sector_update.model_dump(exclude_unset=True)
+        )
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Sector with this name already exists",
+        )
+    
     if not db_sector:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Sector not found",
         )
-    
-    # Check if updated name conflicts with existing sector
-    if sector_update.name and sector_update.name != db_sector.name:
-        existing_sector = db.query(Sector).filter(Sector.name == sector_update.name).first()
-        if existing_sector:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Sector with this name already exists",
-            )
-    
-    for key, value in sector_update.model_dump(exclude_unset=True).items():
-        setattr(db_sector, key, value)
-    
-    db.commit()
-    db.refresh(db_sector)
     return db_sector
 
 
@@ -94,10 +95,10 @@ async def update_sector(
 async def delete_sector(
     sector_id: int,
     current_user: User = Depends(get_current_admin),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Delete sector (admin only)."""
-    db_sector = db.query(Sector).filter(Sector.id == sector_id).first()
+    db_sector = await get_sector_by_id(db, sector_id)
     if not db_sector:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -105,12 +106,12 @@ async def delete_sector(
         )
     
     # Check if sector is being used in any contributions
-    if db_sector.contributions:
+    if await db.scalar(select(exists().where(Contribution.sector_id == sector_id))):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot delete sector that is being used in contributions",
         )
     
-    db.delete(db_sector)
-    db.commit()
+    await db.delete(db_sector)
+    await db.commit()
     return None
\ No newline at end of file
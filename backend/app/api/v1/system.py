@@ -0,0 +1,34 @@
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends
+
+from app.core.deps import get_current_admin
+from app.core.rate_limit import get_rate_limit_stats
+from app.core.security import token_cache
+from app.core.token_versions import token_versions
+from app.core.user_cache import user_cache
+from app.db.base import engine, replica_router
+from app.db.models import User
+from app.db.pool import get_pool_stats
+from app.services.ipfs import ipfs_client
+from app.services.siwe_verifier import siwe_verifier
+
+router = APIRouter()
+
+
+@router.get("/stats", response_model=Dict[str, Any])
+async def get_system_stats(
+    current_user: User = Depends(get_current_admin),
+):
+    """Get runtime statistics for this worker (admin only)."""
+    return {
+        "db_pool": get_pool_stats(engine),
+        "db_replicas": replica_router.stats(),
+        "db_replica_fallbacks": replica_router.fallbacks,
+        "user_cache": user_cache.stats(),
+        "token_cache": token_cache.stats(),
+        "token_versions": token_versions.stats(),
+        "siwe_verifier": siwe_verifier.stats(),
+        "rate_limit": get_rate_limit_stats(),
+        "ipfs_cache": ipfs_client.cache.stats(),
+    }
@@ -1,14 +1,21 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_db, get_current_user, get_current_admin
+from app.core.deps import get_db, get_read_db, get_current_user, get_current_admin
+from app.core.token_versions import token_versions
+from app.core.user_cache import user_cache
+from app.core.pagination import paginate, set_next_cursor
 from app.db.models import User, UserRole, KYCStatus
+from app.db.queries import update_returning
 from app.db.schemas import User as UserSchema, UserUpdate
 
 router = APIRouter()
 
+USER_SORT_KEYS = (User.id,)
+
 
 @router.get("/me", response_model=UserSchema)
 async def get_current_user_info(
@@ -22,7 +29,7 @@ async def get_current_user_info(
 async def update_user_info(
     user_update: UserUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Update current user information."""
     # Only allow updating certain fields
@@ -30,30 +37,34 @@ async def update_user_info(
         if key not in ["reputation", "role", "kyc_status"]:
             setattr(current_user, key, value)
     
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
+    await user_cache.invalidate(current_user.wallet)
     return current_user
 
 
 @router.get("/", response_model=List[UserSchema])
 async def get_users(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     role: Optional[UserRole] = None,
     kyc_status: Optional[KYCStatus] = None,
     current_user: User = Depends(get_current_admin),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get all users (admin only)."""
-    query = db.query(User)
+    query = select(User)
     
     if role:
-        query = query.filter(User.role == role)
+        query = query.where(User.role == role)
     
     if kyc_status:
-        query = query.filter(User.kyc_status == kyc_status)
+        query = query.where(User.kyc_status == kyc_status)
     
-    users = query.offset(skip).limit(limit).all()
+    result = await db.scalars(paginate(query, USER_SORT_KEYS, skip, limit, cursor, descending=False))
+    users = result.all()
+    set_next_cursor(response, users, USER_SORT_KEYS, limit)
     return users
 
 
@@ -61,10 +72,10 @@ async def get_users(
 async def get_user(
     user_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Get user by ID."""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -78,19 +89,23 @@ async def update_user_role(
     user_id: int,
     role: UserRole,
     current_user: User = Depends(get_current_admin),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Update user role (admin only)."""
-    user = db.query(User).filter(User.id == user_id).first()
+    # Bumping the token version makes role guards stop trusting the role
+    # claim in this user's existing tokens
+    user = await update_returning(
+        db, User, user_id, {"role": role, "token_version": User.token_version + 1}
+    )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
     
-    user.role = role
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await user_cache.invalidate(user.wallet)
+    await token_versions.set(user.id, user.token_version)
     return user
 
 
@@ -99,17 +114,16 @@ async def update_user_kyc_status(
     user_id: int,
     kyc_status: KYCStatus,
     current_user: User = Depends(get_current_admin),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Update user KYC status (admin only)."""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await update_returning(db, User, user_id, {"kyc_status": kyc_status})
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
     
-    user.kyc_status = kyc_status
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await user_cache.invalidate(user.wallet)
     return user
\ No newline at end of file
@@ -1,27 +1,39 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps import get_db, get_current_user, get_current_verifier
+from app.core.pagination import paginate, set_next_cursor
 from app.db.models import User, Contribution, ContributionStatus
+from app.db.queries import get_contribution_by_id
 from app.db.schemas import Contribution as ContributionSchema
 from app.services.web3client import web3_client
 
 router = APIRouter()
 
+# Oldest pending contributions are reviewed first
+PENDING_SORT_KEYS = (Contribution.created_at, Contribution.id)
+
 
 @router.get("/pending", response_model=List[ContributionSchema])
 async def get_pending_verifications(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_verifier),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Get all pending contributions for verification (verifier only)."""
-    contributions = db.query(Contribution).filter(
-        Contribution.status == ContributionStatus.PENDING
-    ).offset(skip).limit(limit).all()
+    query = select(Contribution).where(Contribution.status == ContributionStatus.PENDING)
+    result = await db.scalars(
+        paginate(query, PENDING_SORT_KEYS, skip, limit, cursor, descending=False)
+    )
+    contributions = result.all()
+    set_next_cursor(response, contributions, PENDING_SORT_KEYS, limit)
     
     return contributions
 
@@ -30,10 +42,12 @@ async def get_pending_verifications(
 async def approve_contribution(
     contribution_id: int,
     current_user: User = Depends(get_current_verifier),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Approve a contribution (verifier only)."""
-    contribution = db.query(Contribution).filter(Contribution.id == contribution_id).first()
+    contribution = await db.get(
+        Contribution, contribution_id, options=[joinedload(Contribution.user)]
+    )
     if not contribution:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -48,8 +62,7 @@ async def approve_contribution(
     
     # Update status
     contribution.status = ContributionStatus.APPROVED
-    db.commit()
-    db.refresh(contribution)
+    await db.commit()
     
     # Register contribution on blockchain
     try:
@@ -72,10 +85,10 @@ async def reject_contribution(
     contribution_id: int,
     reason: str,
     current_user: User = Depends(get_current_verifier),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """Reject a contribution (verifier only)."""
-    contribution = db.query(Contribution).filter(Contribution.id == contribution_id).first()
+    contribution = await get_contribution_by_id(db, contribution_id)
     if not contribution:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -91,7 +104,6 @@ async def reject_contribution(
     # Update status and add rejection reason
     contribution.status = ContributionStatus.REJECTED
     contribution.rejection_reason = reason
-    db.commit()
-    db.refresh(contribution)
+    await db.commit()
     
     return contribution
\ No newline at end of file
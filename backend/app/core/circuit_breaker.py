@@ -0,0 +1,67 @@
+import time
+from typing import Any, Dict, Optional
+
+
+class CircuitBreaker:
+    """Stops calling a failing dependency for a while.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    allow() returns False for `reset_timeout` seconds. Then a single trial
+    call is let through (half-open); its success closes the circuit and
+    its failure opens it again. A trial that ends without either outcome
+    (cancelled, or an unrelated error) must be released with
+    release_trial() so the next call can retry.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+        self.opens = 0  # Times the circuit has opened
+        self.failures = 0  # Failed calls
+        self.short_circuits = 0  # Calls skipped while open
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return "open"
+        return "half_open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return True
+        self.short_circuits += 1
+        return False
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def release_trial(self) -> None:
+        self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.consecutive_failures += 1
+        if self.trial_in_flight or self.consecutive_failures >= self.failure_threshold:
+            if self.opened_at is None:
+                self.opens += 1
+            self.opened_at = time.monotonic()
+        self.trial_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "opens": self.opens,
+            "failures": self.failures,
+            "short_circuits": self.short_circuits,
+        }
@@ -12,12 +12,57 @@ class Settings(BaseSettings):
     JWT_SECRET: str
     JWT_ALGORITHM: str = "HS256"
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
+    JWT_CACHE_MAX_SIZE: int = 10000  # Verified tokens kept per worker
     
     # Database settings
     DATABASE_URL: str
+    DATABASE_POOL_SIZE: int = 10  # Persistent connections per worker
+    DATABASE_MAX_OVERFLOW: int = 20  # Extra connections allowed under burst load
+    DATABASE_POOL_TIMEOUT: float = 30.0  # Seconds to wait for a free connection
+    DATABASE_POOL_PRE_PING: bool = True  # Test connections on checkout
+    DATABASE_POOL_RECYCLE: int = 1800  # Seconds before a connection is replaced
+    DATABASE_STATEMENT_CACHE_SIZE: int = 500  # Prepared statements kept per connection
+    DATABASE_PGBOUNCER_TRANSACTION_MODE: bool = False  # Connecting through pgbouncer in transaction mode
+    DATABASE_REPLICA_URLS: str = ""  # Comma-separated read replica URLs
+    DATABASE_REPLICA_MAX_LAG_SECONDS: float = 5.0  # Replicas further behind are skipped
+    DATABASE_REPLICA_CHECK_INTERVAL: float = 10.0  # Seconds between replica health checks
     
     # Redis settings
     REDIS_URL: str
+    REDIS_MAX_CONNECTIONS: int = 50  # Shared pool size per worker
+    REDIS_POOL_TIMEOUT: float = 5.0  # Seconds to wait for a free connection
+    
+    # Authenticated user cache
+    USER_CACHE_BACKEND: str = "memory"  # "memory" (per worker), "redis" (shared) or "none"
+    USER_CACHE_TTL_SECONDS: int = 30  # Upper bound on staleness across workers
+    USER_CACHE_MAX_SIZE: int = 10000  # Entries kept per worker by the memory backend
+    TOKEN_VERSION_REDIS_TIMEOUT: float = 0.1  # Seconds before a token version check falls back to the database
+    TOKEN_VERSION_BREAKER_THRESHOLD: int = 5  # Consecutive Redis failures before checks go straight to the database
+    TOKEN_VERSION_BREAKER_RESET_SECONDS: float = 10.0
+    
+    # SIWE nonce store
+    NONCE_STORE_BACKEND: str = "redis"  # "redis" (shared) or "memory" (single worker only)
+    NONCE_TTL_SECONDS: int = 300  # Time allowed between /auth/nonce and /auth/verify
+    NONCE_STORE_MAX_SIZE: int = 10000  # Pending nonces kept by the memory backend
+    
+    # SIWE signature verification pool
+    SIWE_VERIFY_WORKERS: int = 4  # Concurrent verifications per API worker
+    SIWE_VERIFY_MAX_QUEUE: int = 100  # Waiting verifications before /auth/verify returns 503
+    SIWE_VERIFY_USE_PROCESSES: bool = False  # Use a process pool instead of threads
+    
+    # Rate limiting
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_ALGORITHM: str = "sliding_window"  # "fixed_window", "sliding_window" or "gcra"
+    RATE_LIMIT_LOCAL_BATCH: int = 10  # Units a worker leases from Redis at once; 1 checks Redis per request
+    RATE_LIMIT_LOCAL_TTL_SECONDS: float = 1.0  # How long leased units stay usable
+    RATE_LIMIT_LOCAL_MAX_KEYS: int = 10000  # Local buckets kept per limiter
+    RATE_LIMIT_API_TIMES: int = 600  # Budget units per client across the whole API...
+    RATE_LIMIT_API_SECONDS: int = 60  # ...per this many seconds
+    RATE_LIMIT_UPLOAD_COST: int = 20  # Units a multipart upload spends; other requests spend 1
+    RATE_LIMIT_REDIS_TIMEOUT: float = 0.05  # Seconds before a Redis check falls back to local limits
+    RATE_LIMIT_BREAKER_THRESHOLD: int = 5  # Consecutive Redis failures that open the circuit
+    RATE_LIMIT_BREAKER_RESET_SECONDS: float = 10.0  # How long to stay on local limits before retrying Redis
+    TRUSTED_PROXIES: str = ""  # Comma-separated proxy IPs/CIDRs whose X-Forwarded-For is honoured
     
     # Web3 settings
     WEB3_RPC_URL: str
@@ -28,6 +73,17 @@ class Settings(BaseSettings):
     
     # IPFS settings
     IPFS_API_URL: str
+    IPFS_MAX_CONNECTIONS: int = 100  # Pooled connections to the IPFS API per worker
+    IPFS_KEEPALIVE_TIMEOUT: float = 30.0  # Seconds an idle connection is kept open
+    IPFS_CONNECT_TIMEOUT: float = 5.0
+    IPFS_ADD_TIMEOUT: float = 600.0  # Total seconds for an upload
+    IPFS_GET_TIMEOUT: float = 300.0  # Total seconds for a download
+    IPFS_READ_TIMEOUT: float = 60.0  # Seconds a streamed download may stall
+    IPFS_PIN_TIMEOUT: float = 120.0
+    IPFS_MAX_UPLOAD_SIZE: int = 1024 * 1024 * 1024  # Bytes; larger uploads are rejected with 413
+    IPFS_CACHE_DIR: str = "/tmp/contriblock-ipfs-cache"  # Local disk cache of downloaded files, keyed by CID
+    IPFS_CACHE_MAX_BYTES: int = 0  # Per worker, so workers sharing the dir may use N times this; 0 disables the cache
+    IPFS_CACHE_MAX_FILE_SIZE: int = 512 * 1024 * 1024  # Larger files are always streamed from IPFS
     
     # CORS settings
     CORS_ORIGINS: str
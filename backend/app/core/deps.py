@@ -1,22 +1,31 @@
-from typing import Generator, Optional
+from typing import Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from pydantic import ValidationError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
 from app.core.config import settings
-from app.core.security import verify_token
-from app.db.base import get_db
+from app.core.nonce_store import NonceStore, nonce_store
+from app.core.security import verify_token, verify_token_claims
+from app.core.token_versions import token_versions
+from app.core.user_cache import user_cache
+from app.db.base import get_db, get_read_db
 from app.db.models import User, UserRole
+from app.db.queries import get_user_by_wallet
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
+def get_nonce_store() -> NonceStore:
+    return nonce_store
+
+
+async def get_current_user(
+    db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme)
 ) -> User:
     wallet_address = verify_token(token)
     if not wallet_address:
@@ -26,19 +35,61 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = db.query(User).filter(User.wallet == wallet_address).first()
+    cached = await user_cache.get(wallet_address)
+    if cached:
+        # Attach the cached row to this session without a query, so routes
+        # can still modify and commit current_user
+        user = User(**cached)
+        make_transient_to_detached(user)
+        db.add(user)
+        return user
+
+    return await load_user(db, wallet_address)
+
+
+async def load_user(db: AsyncSession, wallet_address: str) -> User:
+    """Load a user from the database and refresh its cache entry."""
+    user = await get_user_by_wallet(db, wallet_address)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    await user_cache.set(wallet_address, user)
     
     return user
 
 
-def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
     return current_user
 
 
-def get_current_verifier(
-    current_user: User = Depends(get_current_active_user),
+async def get_token_user(
+    db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme)
+) -> User:
+    """Resolve the caller from token claims, for role-guarded routes.
+
+    When the token's "ver" claim matches the user's current token version,
+    its "role" claim is still accurate and the returned User is built from
+    the claims alone: it is not attached to the session and only carries
+    id, wallet and role. Older tokens, including ones issued before a role
+    change, fall back to loading the user from the database; the user cache
+    is skipped because other workers' entries may still hold the old role.
+    """
+    claims = verify_token_claims(token)
+    if not claims or not claims.get("sub"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    if {"uid", "role", "ver"} <= claims.keys():
+        if await token_versions.get(db, claims["uid"]) == claims["ver"]:
+            return User(id=claims["uid"], wallet=claims["sub"], role=UserRole(claims["role"]))
+    
+    return await load_user(db, claims["sub"])
+
+
+async def get_current_verifier(
+    current_user: User = Depends(get_token_user),
 ) -> User:
     if current_user.role != UserRole.VERIFIER and current_user.role != UserRole.ADMIN:
         raise HTTPException(
@@ -48,8 +99,8 @@ def get_current_verifier(
     return current_user
 
 
-def get_current_admin(
-    current_user: User = Depends(get_current_active_user),
+async def get_current_admin(
+    current_user: User = Depends(get_token_user),
 ) -> User:
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(
@@ -0,0 +1,234 @@
+import asyncio
+import hashlib
+import mmap
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from typing import AsyncIterator, BinaryIO, Dict, Optional
+
+
+TMP_SUFFIX = ".tmp"
+# Temp files untouched for this long belong to writes that died; live
+# writes update the mtime with every chunk
+STALE_TMP_SECONDS = 600
+
+
+class DiskCacheWriter:
+    """Writes one entry to a temp file and publishes it atomically on commit.
+
+    Readers never see a partial file: the data only appears under its final
+    name via os.replace() once it is complete. Entries that grow past the
+    cache's max_item_size are dropped instead of committed.
+    """
+
+    def __init__(self, cache: "DiskCache", name: str):
+        self.cache = cache
+        self.name = name
+        self.size = 0
+        fd, self.tmp_path = tempfile.mkstemp(dir=cache.directory, suffix=TMP_SUFFIX)
+        self.file: Optional[BinaryIO] = os.fdopen(fd, "wb")
+
+    async def write(self, chunk: bytes) -> None:
+        if self.file is None:
+            return
+        self.size += len(chunk)
+        if self.size > self.cache.max_item_size:
+            self.abort()
+            return
+        await asyncio.to_thread(self.file.write, chunk)
+
+    async def commit(self) -> None:
+        if self.file is None:
+            return
+        if self.size == 0:
+            # mmap can't map empty files; they're cheap to fetch anyway
+            self.abort()
+            return
+        file, self.file = self.file, None
+        try:
+            await asyncio.to_thread(file.close)
+            os.replace(self.tmp_path, self.cache.path(self.name))
+        except OSError as e:
+            print(f"Error writing disk cache entry: {e}")
+            self._remove_tmp()
+            return
+        self.cache.add(self.name, self.size)
+
+    def abort(self) -> None:
+        if self.file is None:
+            return
+        self.file.close()
+        self.file = None
+        self._remove_tmp()
+
+    def _remove_tmp(self) -> None:
+        try:
+            os.unlink(self.tmp_path)
+        except FileNotFoundError:
+            pass
+
+
+class DiskCache:
+    """Size-capped LRU cache of immutable blobs stored as files in a directory.
+
+    Entries are named by the SHA-256 of their key, so any string is a safe
+    key. The index is kept per process and rebuilt from the directory
+    (oldest modification first) on open(); workers sharing a directory may
+    together exceed max_bytes and may evict each other's files, which the
+    next lookup treats as a miss.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, max_item_size: int, chunk_size: int = 256 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_item_size = min(max_item_size, max_bytes)
+        self.chunk_size = chunk_size
+        self.enabled = False
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+
+    def open(self) -> None:
+        """Create the directory and index the entries left by earlier runs."""
+        if self.enabled or self.max_bytes <= 0:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            entries = []
+            stale_before = time.time() - STALE_TMP_SECONDS
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                    if entry.name.endswith(TMP_SUFFIX):
+                        # Other workers may be writing to theirs right now;
+                        # only remove ones left behind by writes that died
+                        if stat.st_mtime < stale_before:
+                            self._remove(entry.path)
+                        continue
+                    entries.append((stat.st_mtime, entry.name, stat.st_size))
+        except OSError as e:
+            print(f"Error opening disk cache, caching disabled: {e}")
+            return
+
+        for _, name, size in sorted(entries):
+            self._index[name] = size
+            self.size += size
+        self.enabled = True
+        self._evict()
+
+    def key_name(self, key: str) -> str:
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def get_size(self, key: str) -> Optional[int]:
+        """Size of a cached entry, without counting a hit or miss."""
+        return self._index.get(self.key_name(key))
+
+    def open_mmap(self, key: str) -> Optional[mmap.mmap]:
+        """Map a cached entry read-only, or return None on a miss.
+
+        The mapping stays valid even if the entry is evicted while it is
+        being read, since unlinking doesn't free a mapped file.
+        """
+        name = self.key_name(key)
+        if name not in self._index:
+            self.misses += 1
+            return None
+        try:
+            with open(self.path(name), "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Evicted by another worker, or empty (which mmap rejects)
+            self._discard(name)
+            self.misses += 1
+            return None
+        if hasattr(mmap, "MADV_SEQUENTIAL"):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        self._index.move_to_end(name)
+        self.hits += 1
+        return mm
+
+    async def iter_mmap(self, mm: mmap.mmap, offset: int = 0, length: Optional[int] = None) -> AsyncIterator[bytes]:
+        """Yield a mapped entry, or `length` bytes of it from `offset`, in chunks.
+
+        Chunks are copied off the mapping in a thread so that page faults
+        on a cold file don't block the event loop.
+        """
+        end = len(mm) if length is None else min(offset + length, len(mm))
+        try:
+            for start in range(offset, end, self.chunk_size):
+                yield await asyncio.to_thread(mm.__getitem__, slice(start, min(start + self.chunk_size, end)))
+        finally:
+            mm.close()
+
+    async def read(self, key: str) -> Optional[bytes]:
+        mm = self.open_mmap(key)
+        if mm is None:
+            return None
+        try:
+            return await asyncio.to_thread(mm.__getitem__, slice(None))
+        finally:
+            mm.close()
+
+    def writer(self, key: str) -> Optional[DiskCacheWriter]:
+        """Start writing an entry, or return None if caching is disabled."""
+        if not self.enabled:
+            return None
+        try:
+            return DiskCacheWriter(self, self.key_name(key))
+        except OSError as e:
+            print(f"Error writing disk cache entry: {e}")
+            return None
+
+    async def put(self, key: str, data: bytes) -> None:
+        writer = self.writer(key)
+        if writer is None:
+            return
+        await writer.write(data)
+        await writer.commit()
+
+    def add(self, name: str, size: int) -> None:
+        """Index a committed entry and evict the least recently used to fit."""
+        self.size += size - self._index.pop(name, 0)
+        self._index[name] = size
+        self.writes += 1
+        self._evict()
+
+    def _evict(self) -> None:
+        while self.size > self.max_bytes and self._index:
+            name, size = self._index.popitem(last=False)
+            self.size -= size
+            self.evictions += 1
+            self.evicted_bytes += size
+            self._remove(self.path(name))
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+    def _discard(self, name: str) -> None:
+        self.size -= self._index.pop(name, 0)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "enabled": self.enabled,
+            "files": len(self._index),
+            "bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "evicted_bytes": self.evicted_bytes,
+        }
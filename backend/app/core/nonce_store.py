@@ -0,0 +1,52 @@
+from typing import Optional
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.redis import get_redis
+
+
+class NonceStore:
+    """SIWE nonces keyed by wallet, kept in this process.
+
+    Only suitable for a single worker (and tests): a /verify call served by
+    another process won't see the nonce. Entries expire after the TTL and the
+    store is bounded, so abandoned logins can't grow it without limit.
+    """
+
+    def __init__(self, maxsize: int, ttl: int):
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def put(self, wallet: str, nonce: str) -> None:
+        self.cache.set(wallet, nonce)
+
+    async def pop(self, wallet: str) -> Optional[str]:
+        """Return the wallet's nonce and delete it, so it can be used only once."""
+        nonce = self.cache.get(wallet)
+        self.cache.delete(wallet)
+        return nonce
+
+
+class RedisNonceStore(NonceStore):
+    """SIWE nonces shared by all workers and hosts through Redis."""
+
+    key_prefix = "nonce:"
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+
+    async def put(self, wallet: str, nonce: str) -> None:
+        await get_redis().set(self.key_prefix + wallet, nonce, ex=self.ttl)
+
+    async def pop(self, wallet: str) -> Optional[str]:
+        # GETDEL is atomic, so concurrent /verify calls can't both consume
+        # the same nonce
+        return await get_redis().getdel(self.key_prefix + wallet)
+
+
+def create_nonce_store() -> NonceStore:
+    if settings.NONCE_STORE_BACKEND == "memory":
+        return NonceStore(maxsize=settings.NONCE_STORE_MAX_SIZE, ttl=settings.NONCE_TTL_SECONDS)
+    return RedisNonceStore(ttl=settings.NONCE_TTL_SECONDS)
+
+
+nonce_store = create_nonce_store()
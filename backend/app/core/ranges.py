@@ -0,0 +1,43 @@
+import re
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+
+
+_BYTE_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Parse a Range header into an inclusive (start, end) byte range.
+
+    Returns None, meaning serve the whole file, when there is no header or
+    it isn't a single valid byte range; servers may ignore multi-range
+    requests, and must ignore ranges whose last byte precedes the first
+    (RFC 9110 14.1.1). Raises 416 when the range starts past the end of the
+    file.
+    """
+    if not header:
+        return None
+
+    match = _BYTE_RANGE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        if last and int(last) < start:
+            return None
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        # Suffix range: the last N bytes
+        start = max(size - int(last), 0)
+        end = size - 1
+
+    if start >= size:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
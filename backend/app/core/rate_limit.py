@@ -1,60 +1,429 @@
-from fastapi import Request, HTTPException, status
-from fastapi.responses import JSONResponse
-import redis.asyncio as redis
+import asyncio
+from dataclasses import asdict, dataclass, replace
+from enum import Enum
+import ipaddress
+import math
 import time
-from typing import Callable, Dict, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
+from fastapi import Request, Response, HTTPException, status
+from redis.exceptions import RedisError
+
+from app.core.cache import TTLCache
+from app.core.circuit_breaker import CircuitBreaker
 from app.core.config import settings
+from app.core.redis import get_redis
+from app.core.security import verify_token
+
+
+class RateLimitAlgorithm(str, Enum):
+    FIXED_WINDOW = "fixed_window"
+    SLIDING_WINDOW = "sliding_window"
+    GCRA = "gcra"
+
+
+# Each script runs atomically in one round trip, so concurrent requests
+# can't slip past the limit between a read and a write. They all take
+# ARGV = (window in ms, limit, cost) and return
+# {allowed, remaining, ms until the quota resets, ms until retry}.
+# Denied requests consume nothing.
+SCRIPTS = {
+    # Counts requests in a window started by the first hit. Allows up to
+    # twice the limit across a window boundary.
+    RateLimitAlgorithm.FIXED_WINDOW: """
+local window = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local current = redis.call('INCRBY', KEYS[1], cost)
+if current == cost then
+    redis.call('PEXPIRE', KEYS[1], window)
+end
+local ttl = redis.call('PTTL', KEYS[1])
+if current > limit then
+    redis.call('DECRBY', KEYS[1], cost)
+    return {0, math.max(limit - current + cost, 0), ttl, ttl}
+end
+return {1, limit - current, ttl, 0}
+""",
+    # Weights the previous aligned window's count by how much of it still
+    # overlaps the sliding window, approximating a sliding log in O(1) memory.
+    RateLimitAlgorithm.SLIDING_WINDOW: """
+local window = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local start = now - (now % window)
+
+local state = redis.call('HMGET', KEYS[1], 'start', 'current', 'previous')
+local current = tonumber(state[2]) or 0
+local previous = tonumber(state[3]) or 0
+local stored_start = tonumber(state[1])
+if stored_start ~= start then
+    if stored_start == start - window then
+        previous = current
+    else
+        previous = 0
+    end
+    current = 0
+end
+
+local elapsed = now - start
+local count = previous * (window - elapsed) / window + current
+local remaining = math.max(math.floor(limit - count), 0)
+if count + cost > limit then
+    local retry
+    if current + cost > limit then
+        -- This window is full; in the next one its count becomes the
+        -- decaying previous count
+        retry = window - elapsed + math.ceil(window - (limit - cost) * window / math.max(current, 1))
+    else
+        -- Until the previous window's weight has decayed enough to fit the cost
+        retry = math.ceil(window - (limit - cost - current) * window / previous) - elapsed
+    end
+    return {0, remaining, window - elapsed, math.max(retry, 1)}
+end
+
+current = current + cost
+redis.call('HSET', KEYS[1], 'start', start, 'current', current, 'previous', previous)
+redis.call('PEXPIRE', KEYS[1], 2 * window)
+return {1, math.max(math.floor(limit - count - cost), 0), window - elapsed, 0}
+""",
+    # Generic cell rate algorithm: stores only the theoretical arrival time
+    # of the next request. Requests are spread evenly (one per window/limit)
+    # with bursts of up to limit.
+    RateLimitAlgorithm.GCRA: """
+local window = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local interval = window / limit
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+
+local tat = math.max(tonumber(redis.call('GET', KEYS[1])) or now, now)
+local new_tat = tat + interval * cost
+local allow_at = new_tat - window
+if now < allow_at then
+    local remaining = math.max(math.floor((window - (tat - now)) / interval), 0)
+    return {0, remaining, math.ceil(tat - now), math.ceil(allow_at - now)}
+end
+
+redis.call('SET', KEYS[1], new_tat, 'PX', math.ceil(new_tat - now))
+return {1, math.floor((window - (new_tat - now)) / interval), math.ceil(new_tat - now), 0}
+""",
+}
+
+# Response headers set by RateLimitResult.headers; browsers only let
+# cross-origin clients read them if CORS exposes them
+RATE_LIMIT_HEADERS = ["RateLimit-Limit", "RateLimit-Remaining", "RateLimit-Reset", "Retry-After"]
+
+
+@dataclass
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float  # Seconds until the quota is fully restored
+    retry_after: float  # Seconds until the next request is allowed, 0 if allowed now
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """RateLimit-* headers (IETF draft) plus Retry-After when limited."""
+        headers = {
+            "RateLimit-Limit": str(self.limit),
+            "RateLimit-Remaining": str(self.remaining),
+            "RateLimit-Reset": str(math.ceil(self.reset_after)),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(math.ceil(self.retry_after))
+        return headers
+
+
+@dataclass
+class LocalBucket:
+    """Units leased from Redis for one key, spent without a round trip."""
+
+    tokens: int
+    result: RateLimitResult  # Redis' answer when the units were leased
+    fetched_at: float
+    cost: int = 1  # Cost of the request Redis answered
+
+    def current_result(self, allowed: bool = True) -> RateLimitResult:
+        elapsed = time.monotonic() - self.fetched_at
+        return replace(
+            self.result,
+            allowed=allowed,
+            remaining=self.result.remaining + self.tokens,
+            reset_after=max(self.result.reset_after - elapsed, 0),
+            retry_after=max(self.result.retry_after - elapsed, 0),
+        )
+
+
+@dataclass
+class RateLimitStats:
+    fallback_decisions: int = 0  # Requests limited in-process because Redis was unavailable
+    redis_timeouts: int = 0
+    redis_errors: int = 0
+
+
+rate_limit_stats = RateLimitStats()
+
+# Shared by all limiters: while Redis is unhealthy none of them wait on it
+redis_breaker = CircuitBreaker(
+    failure_threshold=settings.RATE_LIMIT_BREAKER_THRESHOLD,
+    reset_timeout=settings.RATE_LIMIT_BREAKER_RESET_SECONDS,
+)
+
+
+def get_rate_limit_stats() -> Dict[str, Any]:
+    return {"redis_circuit": redis_breaker.stats(), **asdict(rate_limit_stats)}
+
+
+def parse_trusted_proxies(value: str) -> List[Union[ipaddress.IPv4Network, ipaddress.IPv6Network]]:
+    return [ipaddress.ip_network(entry.strip()) for entry in value.split(",") if entry.strip()]
+
+
+trusted_proxies = parse_trusted_proxies(settings.TRUSTED_PROXIES)
+
+
+def is_trusted_proxy(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in trusted_proxies)
+
+
+def get_client_ip(request: Request) -> str:
+    """Client address, taken from X-Forwarded-For when sent by a trusted proxy.
+
+    The header is read right to left, skipping trusted proxies, so a client
+    can't pick its own address by prepending entries.
+    """
+    host = request.client.host if request.client else "unknown"
+    if not is_trusted_proxy(host):
+        return host
+
+    forwarded = request.headers.get("X-Forwarded-For", "")
+    for address in reversed([a.strip() for a in forwarded.split(",") if a.strip()]):
+        if not is_trusted_proxy(address):
+            return address
+    return host
+
+
+def get_client_identity(request: Request) -> str:
+    """Rate-limit identity: the authenticated wallet, else the client IP.
+
+    Users behind one NAT get separate budgets once they sign in.
+    """
+    authorization = request.headers.get("Authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() == "bearer" and token:
+        wallet = verify_token(token)
+        if wallet:
+            return f"wallet:{wallet}"
+    return f"ip:{get_client_ip(request)}"
 
 
 class RateLimiter:
-    def __init__(self, times: int = 5, seconds: int = 60):
-        self.times = times  # Number of requests allowed
+    """Redis-backed limiter with an in-process token bucket in front.
+
+    Instead of spending units in Redis on every request, the limiter leases
+    up to `local_batch` units at once and admits requests from a local
+    bucket until they run out. Lease sizes shrink as Redis reports the
+    quota running out, so near the limit every decision goes to Redis and
+    is exact. Denials are cached until Retry-After. Leases expire after
+    `local_ttl` seconds. Unspent leased units are lost then, so a worker
+    under-admits by at most local_batch per key and lease. With a fixed
+    window, units leased at the end of a window may be spent in the next,
+    which over-admits by at most local_batch per worker.
+
+    Each request costs `cost` units of the `times` per `seconds` budget.
+    Limiters with the same `scope` share a budget; the scope defaults to
+    the route.
+
+    Redis calls time out after RATE_LIMIT_REDIS_TIMEOUT. Failures trip a
+    circuit breaker shared by all limiters. While Redis is failing or the
+    circuit is open, requests are limited by an in-process token bucket
+    instead, so limits become per worker rather than global but requests
+    keep flowing.
+    """
+
+    def __init__(
+        self,
+        times: int = 5,
+        seconds: int = 60,
+        algorithm: RateLimitAlgorithm = RateLimitAlgorithm.FIXED_WINDOW,
+        local_batch: int = 1,
+        local_ttl: float = 1.0,
+        cost: Union[int, Callable[[Request], int]] = 1,
+        scope: Optional[str] = None,
+    ):
+        self.times = times  # Number of units allowed
         self.seconds = seconds  # Time window in seconds
-        self.redis_pool = None
-    
-    async def init_redis_pool(self):
-        if self.redis_pool is None:
-            self.redis_pool = await redis.from_url(settings.REDIS_URL, encoding="utf-8", decode_responses=True)
-    
+        self.algorithm = algorithm
+        self.local_batch = local_batch  # Max units leased per Redis call; 1 disables leasing
+        self.cost = cost  # Units each request spends, or a function of the request
+        self.scope = scope
+        self.script = None
+        self.buckets = TTLCache(maxsize=settings.RATE_LIMIT_LOCAL_MAX_KEYS, ttl=local_ttl)
+        # (tokens, updated_at) per key, used while Redis is unavailable
+        self.fallback_buckets = TTLCache(maxsize=settings.RATE_LIMIT_LOCAL_MAX_KEYS, ttl=seconds)
+        self.remote_checks = 0
+
+    async def check(self, key: str, cost: int = 1) -> RateLimitResult:
+        """Spend `cost` units for `key` in Redis."""
+        redis_client = get_redis()
+        if self.script is None:
+            # Runs via EVALSHA, loading the script on first use
+            self.script = redis_client.register_script(SCRIPTS[self.algorithm])
+
+        self.remote_checks += 1
+        allowed, remaining, reset_ms, retry_ms = await asyncio.wait_for(
+            self.script(keys=[key], args=[self.seconds * 1000, self.times, cost], client=redis_client),
+            timeout=settings.RATE_LIMIT_REDIS_TIMEOUT,
+        )
+        return RateLimitResult(
+            allowed=bool(allowed),
+            limit=self.times,
+            remaining=int(remaining),
+            reset_after=int(reset_ms) / 1000,
+            retry_after=int(retry_ms) / 1000,
+        )
+
+    async def acquire(self, key: str, cost: int = 1) -> RateLimitResult:
+        """Admit a request costing `cost` units, from the local bucket when possible."""
+        bucket = self.buckets.get(key)
+        if bucket is not None:
+            if not bucket.result.allowed:
+                if (
+                    cost >= bucket.cost
+                    and time.monotonic() - bucket.fetched_at < bucket.result.retry_after
+                ):
+                    return bucket.current_result(allowed=False)
+            elif bucket.tokens >= cost:
+                bucket.tokens -= cost
+                return bucket.current_result()
+
+        if not redis_breaker.allow():
+            return self.acquire_fallback(key, cost)
+
+        try:
+            result, leftover = await self._lease(key, cost, bucket)
+        except (RedisError, OSError, asyncio.TimeoutError) as e:
+            if isinstance(e, asyncio.TimeoutError):
+                rate_limit_stats.redis_timeouts += 1
+            else:
+                rate_limit_stats.redis_errors += 1
+                print(f"Error checking rate limit: {e}")
+            redis_breaker.record_failure()
+            return self.acquire_fallback(key, cost)
+        except BaseException:
+            # Cancelled (client gone, shutdown) or an unexpected error: says
+            # nothing about Redis, but a half-open trial must not stay taken
+            redis_breaker.release_trial()
+            raise
+        redis_breaker.record_success()
+
+        self.buckets.set(
+            key,
+            LocalBucket(tokens=leftover, result=result, fetched_at=time.monotonic(), cost=cost),
+        )
+        return replace(result, remaining=result.remaining + leftover)
+
+    async def _lease(
+        self, key: str, cost: int, bucket: Optional[LocalBucket]
+    ) -> Tuple[RateLimitResult, int]:
+        """Spend at least `cost` units in Redis; returns the result and the units left over."""
+        # Lease a quarter of what Redis last reported as remaining, so the
+        # lease shrinks to a single request as the limit approaches
+        remaining = bucket.result.remaining if bucket is not None else 0
+        lease = max(min(self.local_batch, remaining // 4), cost)
+        result = await self.check(key, cost=lease)
+        if not result.allowed and lease > cost and result.remaining >= cost:
+            lease = cost
+            result = await self.check(key, cost=lease)
+
+        return result, (lease - cost if result.allowed else 0)
+
+    def acquire_fallback(self, key: str, cost: int = 1) -> RateLimitResult:
+        """Admit a request from an in-process token bucket holding `times` units."""
+        rate_limit_stats.fallback_decisions += 1
+        rate = self.times / self.seconds
+        now = time.monotonic()
+        tokens, updated_at = self.fallback_buckets.get(key) or (self.times, now)
+        tokens = min(self.times, tokens + (now - updated_at) * rate)
+
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+        self.fallback_buckets.set(key, (tokens, now))
+
+        return RateLimitResult(
+            allowed=allowed,
+            limit=self.times,
+            remaining=int(tokens),
+            reset_after=(self.times - tokens) / rate,
+            retry_after=0 if allowed else (cost - tokens) / rate,
+        )
+
     async def _is_rate_limited(self, key: str) -> bool:
-        await self.init_redis_pool()
-        
-        # Get the current count for this key
-        current = await self.redis_pool.get(key)
-        
-        if current is None:
-            # First request, set to 1 with expiry
-            await self.redis_pool.set(key, 1, ex=self.seconds)
-            return False
-        
-        current_count = int(current)
-        if current_count >= self.times:
-            # Rate limit exceeded
-            return True
-        
-        # Increment the count
-        await self.redis_pool.incr(key)
-        return False
-    
-    async def __call__(self, request: Request):
-        # Get client IP or use a unique identifier
-        client_ip = request.client.host
-        key = f"rate_limit:{client_ip}:{request.url.path}"
-        
-        is_limited = await self._is_rate_limited(key)
-        
-        if is_limited:
+        return not (await self.acquire(key)).allowed
+
+    async def __call__(self, request: Request, response: Response):
+        scope = self.scope
+        if scope is None:
+            # Bucket by route template so /items/1 and /items/2 share a limit
+            route = request.scope.get("route")
+            scope = route.path if route else request.url.path
+        key = f"rate_limit:{self.algorithm.value}:{get_client_identity(request)}:{scope}"
+
+        cost = self.cost(request) if callable(self.cost) else self.cost
+        result = await self.acquire(key, cost)
+
+        if not result.allowed:
             raise HTTPException(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 detail="Rate limit exceeded",
+                headers=result.headers,
             )
 
+        response.headers.update(result.headers)
+
+
+def request_cost(request: Request) -> int:
+    """Budget units for a request: uploads cost RATE_LIMIT_UPLOAD_COST, the rest 1."""
+    if request.headers.get("Content-Type", "").startswith("multipart/form-data"):
+        return settings.RATE_LIMIT_UPLOAD_COST
+    return 1
+
+
+def rate_limited(
+    times: int = 5,
+    seconds: int = 60,
+    algorithm: Optional[RateLimitAlgorithm] = None,
+    cost: Union[int, Callable[[Request], int]] = 1,
+    scope: Optional[str] = None,
+):
+    """Dependency limiting each client to `times` units per `seconds`.
+
+    Usage: `dependencies=[Depends(rate_limited(10, 60))]`. Each request
+    spends `cost` units (an int, or a function of the request). Routes
+    passing the same `scope` (and the same times, seconds and algorithm)
+    share one budget. The algorithm defaults to RATE_LIMIT_ALGORITHM.
+    """
+    limiter = RateLimiter(
+        times,
+        seconds,
+        algorithm or RateLimitAlgorithm(settings.RATE_LIMIT_ALGORITHM),
+        local_batch=settings.RATE_LIMIT_LOCAL_BATCH,
+        local_ttl=settings.RATE_LIMIT_LOCAL_TTL_SECONDS,
+        cost=cost,
+        scope=scope,
+    )
+
+    async def rate_limit_dependency(request: Request, response: Response):
+        if settings.RATE_LIMIT_ENABLED:
+            await limiter(request, response)
 
-def rate_limited(times: int = 5, seconds: int = 60):
-    limiter = RateLimiter(times, seconds)
-    
-    async def rate_limit_dependency(request: Request):
-        await limiter(request)
-    
-    return rate_limit_dependency
\ No newline at end of file
+    return rate_limit_dependency
@@ -0,0 +1,35 @@
+from typing import Optional
+
+import redis.asyncio as redis
+
+from app.core.config import settings
+
+
+_redis: Optional[redis.Redis] = None
+
+
+def get_redis() -> redis.Redis:
+    """Return the process-wide Redis client, creating its pool on first use.
+
+    Everything in the app (rate limits, nonces, caches) shares this pool.
+    When all connections are busy callers wait up to REDIS_POOL_TIMEOUT for
+    one instead of opening more.
+    """
+    global _redis
+    if _redis is None:
+        pool = redis.BlockingConnectionPool.from_url(
+            settings.REDIS_URL,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            timeout=settings.REDIS_POOL_TIMEOUT,
+            encoding="utf-8",
+            decode_responses=True,
+        )
+        _redis = redis.Redis(connection_pool=pool)
+    return _redis
+
+
+async def close_redis() -> None:
+    global _redis
+    if _redis is not None:
+        await _redis.aclose(close_connection_pool=True)
+        _redis = None
@@ -1,37 +1,63 @@
+import hashlib
+import time
 from datetime import datetime, timedelta
-from typing import Optional, Union, Any
+from typing import Any, Dict, Optional, Union
 
 from jose import jwt
 from passlib.context import CryptContext
 
+from app.core.cache import TTLCache
 from app.core.config import settings
 
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Verified tokens, keyed by SHA-256 digest, mapped to their claims. Entries
+# expire together with the token so an expired token is never accepted.
+token_cache = TTLCache(
+    maxsize=settings.JWT_CACHE_MAX_SIZE,
+    ttl=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
+
 
 def create_access_token(
-    subject: Union[str, Any], expires_delta: Optional[timedelta] = None
+    subject: Union[str, Any],
+    expires_delta: Optional[timedelta] = None,
+    extra_claims: Optional[Dict[str, Any]] = None,
 ) -> str:
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {**(extra_claims or {}), "exp": expire, "sub": str(subject)}
     encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
     return encoded_jwt
 
 
-def verify_token(token: str) -> Optional[str]:
+def verify_token_claims(token: str) -> Optional[Dict[str, Any]]:
+    """Return the claims of a valid token, or None."""
+    digest = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(digest)
+    if payload is not None:
+        return payload
+
     try:
         payload = jwt.decode(
             token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM]
         )
-        return payload["sub"]
     except jwt.JWTError:
         return None
 
+    if "exp" in payload:
+        token_cache.set(digest, payload, ttl=payload["exp"] - time.time())
+    return payload
+
+
+def verify_token(token: str) -> Optional[str]:
+    payload = verify_token_claims(token)
+    return payload["sub"] if payload else None
+
 
 def generate_nonce() -> str:
     """Generate a random nonce for SIWE authentication."""
@@ -0,0 +1,121 @@
+import asyncio
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.db.models import User
+
+
+class TokenVersionCache:
+    """Current users.token_version per user id, cached in this worker.
+
+    Role guards compare a token's "ver" claim against this value to decide
+    whether its "role" claim can be trusted. A role change bumps the
+    version, but other workers would only see it once their entry expires,
+    so this class is used uncached (maxsize 0) to read the database on
+    every check when no shared cache is wanted.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def _get_cached(self, user_id: int) -> Optional[int]:
+        return self.cache.get(user_id)
+
+    async def set(self, user_id: int, version: int) -> None:
+        self.cache.set(user_id, version)
+
+    async def _fill(self, user_id: int, version: int) -> None:
+        await self.set(user_id, version)
+
+    async def get(self, db: AsyncSession, user_id: int) -> Optional[int]:
+        version = await self._get_cached(user_id)
+        if version is None:
+            version = await db.scalar(select(User.token_version).where(User.id == user_id))
+            if version is not None:
+                await self._fill(user_id, version)
+        return version
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "memory", **self.cache.stats()}
+
+
+class RedisTokenVersionCache(TokenVersionCache):
+    """Token versions shared by all workers, so demotions apply everywhere at once.
+
+    Every role-guarded request reads Redis, so calls are bounded by
+    TOKEN_VERSION_REDIS_TIMEOUT and skipped while a circuit breaker is
+    open. Errors and timeouts are treated as misses, so checks fall back to
+    the database rather than to a possibly stale value.
+    """
+
+    key_prefix = "token_version:"
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.breaker = CircuitBreaker(
+            failure_threshold=settings.TOKEN_VERSION_BREAKER_THRESHOLD,
+            reset_timeout=settings.TOKEN_VERSION_BREAKER_RESET_SECONDS,
+        )
+
+    async def _call(self, action: str, method: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Run a Redis command; returns None if it fails, times out or is short-circuited."""
+        if not self.breaker.allow():
+            return None
+        try:
+            result = await asyncio.wait_for(
+                method(*args, **kwargs), timeout=settings.TOKEN_VERSION_REDIS_TIMEOUT
+            )
+        except Exception as e:
+            print(f"Error {action} token versions: {e!r}")
+            self.breaker.record_failure()
+            return None
+        except BaseException:
+            self.breaker.release_trial()
+            raise
+        self.breaker.record_success()
+        return result
+
+    async def _get_cached(self, user_id: int) -> Optional[int]:
+        version = await self._call("reading", get_redis().get, f"{self.key_prefix}{user_id}")
+        if version is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return int(version)
+
+    async def set(self, user_id: int, version: int) -> None:
+        await self._call("writing", get_redis().set, f"{self.key_prefix}{user_id}", version, ex=self.ttl)
+
+    async def _fill(self, user_id: int, version: int) -> None:
+        # NX: a version read from the database just before a role change
+        # must not overwrite the new one set by the role update
+        await self._call(
+            "writing", get_redis().set, f"{self.key_prefix}{user_id}", version, ex=self.ttl, nx=True
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "redis",
+            "hits": self.hits,
+            "misses": self.misses,
+            "redis_circuit": self.breaker.stats(),
+        }
+
+
+def create_token_version_cache() -> TokenVersionCache:
+    # Versions gate revocation of role claims, so they are never cached per
+    # worker: the memory user cache backend still keeps them in Redis
+    if settings.USER_CACHE_BACKEND == "none":
+        return TokenVersionCache(maxsize=0, ttl=0)
+    return RedisTokenVersionCache(ttl=settings.USER_CACHE_TTL_SECONDS)
+
+
+token_versions = create_token_version_cache()
@@ -0,0 +1,99 @@
+from typing import Any, Dict, Optional
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.db.schemas import UserInDB
+
+
+class UserCache:
+    """Cache of authenticated users' column values, keyed by wallet.
+
+    Values are plain dicts (UserInDB fields) rather than ORM instances so
+    they can outlive the session that loaded them. Each worker keeps its
+    own copy, so invalidation is local and other workers catch up within
+    the TTL.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, wallet: str) -> Optional[Dict[str, Any]]:
+        return self.cache.get(wallet)
+
+    async def set(self, wallet: str, user: Any) -> None:
+        self.cache.set(wallet, UserInDB.model_validate(user).model_dump())
+
+    async def invalidate(self, wallet: str) -> None:
+        self.cache.delete(wallet)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "memory", **self.cache.stats()}
+
+
+class RedisUserCache(UserCache):
+    """User cache shared by all workers through Redis.
+
+    Invalidation is visible to every process immediately. Redis errors are
+    treated as cache misses so authentication falls back to the database.
+    """
+
+    key_prefix = "user:"
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, wallet: str) -> Optional[Dict[str, Any]]:
+        try:
+            data = await get_redis().get(self.key_prefix + wallet)
+        except Exception as e:
+            print(f"Error reading user cache: {e}")
+            data = None
+
+        if data is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return UserInDB.model_validate_json(data).model_dump()
+
+    async def set(self, wallet: str, user: Any) -> None:
+        try:
+            await get_redis().set(
+                self.key_prefix + wallet,
+                UserInDB.model_validate(user).model_dump_json(),
+                ex=self.ttl,
+            )
+        except Exception as e:
+            print(f"Error writing user cache: {e}")
+
+    async def invalidate(self, wallet: str) -> None:
+        try:
+            await get_redis().delete(self.key_prefix + wallet)
+        except Exception as e:
+            print(f"Error invalidating user cache: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "redis", "hits": self.hits, "misses": self.misses}
+
+
+class NullUserCache(UserCache):
+    """Disabled cache: every lookup goes to the database."""
+
+    def __init__(self):
+        self.cache = TTLCache(maxsize=0, ttl=0)
+
+    async def set(self, wallet: str, user: Any) -> None:
+        pass
+
+
+def create_user_cache() -> UserCache:
+    if settings.USER_CACHE_BACKEND == "redis":
+        return RedisUserCache(ttl=settings.USER_CACHE_TTL_SECONDS)
+    if settings.USER_CACHE_BACKEND == "none":
+        return NullUserCache()
+    return UserCache(maxsize=settings.USER_CACHE_MAX_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS)
+
+
+user_cache = create_user_cache()
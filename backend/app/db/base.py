@@ -1,18 +1,129 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from typing import Any, AsyncGenerator, Dict
+from uuid import uuid4
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncAttrs, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, ORMExecuteState, raiseload
 
 from app.core.config import settings
+from app.db.pool import InstrumentedQueuePool
+from app.db.replicas import ReplicaRouter
+
+
+def get_async_database_url(url: str) -> str:
+    """Map a sync DATABASE_URL onto its asyncio driver (asyncpg / aiosqlite)."""
+    scheme, sep, rest = url.partition("://")
+    driver = scheme.split("+", 1)[0]
+    if driver in ("postgresql", "postgres"):
+        return f"postgresql+asyncpg{sep}{rest}"
+    if driver == "sqlite":
+        return f"sqlite+aiosqlite{sep}{rest}"
+    return url
+
+
+def get_connect_args() -> Dict[str, Any]:
+    """asyncpg prepared statement settings.
+
+    asyncpg prepares every statement server-side and caches it per
+    connection, so repeated lookups skip parsing and planning. Behind
+    pgbouncer in transaction mode consecutive transactions may land on
+    different server connections, so the caches are disabled and statement
+    names made unique to avoid "prepared statement does not exist" errors.
+    """
+    if settings.DATABASE_PGBOUNCER_TRANSACTION_MODE:
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+
+    return {
+        "statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+    }
+
+
+def get_engine_options(url: str) -> Dict[str, Any]:
+    """Pool configuration for the given database URL."""
+    if url.startswith("sqlite"):
+        # SQLite uses its own single-file pooling and rejects sizing options
+        return {}
+
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+        "pool_pre_ping": settings.DATABASE_POOL_PRE_PING,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+        "connect_args": get_connect_args(),
+    }
+
 
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine = create_async_engine(
+    get_async_database_url(settings.DATABASE_URL),
+    **get_engine_options(settings.DATABASE_URL),
+)
+SessionLocal = async_sessionmaker(
+    bind=engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
 
-Base = declarative_base()
+replica_router = ReplicaRouter(
+    [
+        create_async_engine(get_async_database_url(url), **get_engine_options(url))
+        for url in (url.strip() for url in settings.DATABASE_REPLICA_URLS.split(","))
+        if url
+    ],
+    max_lag=settings.DATABASE_REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.DATABASE_REPLICA_CHECK_INTERVAL,
+)
 
 
-def get_db():
-    db = SessionLocal()
-    try:
+class Base(AsyncAttrs, DeclarativeBase):
+    pass
+
+
+def raise_on_lazy_load(execute_state: ORMExecuteState) -> None:
+    """do_orm_execute hook making implicit relationship loads raise.
+
+    Relationships must be loaded explicitly (joinedload / selectinload) by the
+    query that needs them; registering this hook on Session turns any
+    accidental per-row lazy load into an error instead of an extra query.
+    """
+    if (
+        execute_state.is_select
+        and not execute_state.is_column_load
+        and not execute_state.is_relationship_load
+    ):
+        execute_state.statement = execute_state.statement.options(raiseload("*", sql_only=True))
+
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
+
+
+async def release_connection(db: AsyncSession) -> None:
+    """Commit the current transaction so its connection returns to the pool.
+
+    Call this before awaiting slow external I/O (IPFS, RPC) so connection
+    hold time is bounded by SQL time. Loaded objects stay usable because
+    sessions don't expire on commit; the next query checks out a new
+    connection.
+    """
+    await db.commit()
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only queries, served by a replica when one is healthy."""
+    replica = await replica_router.choose()
+    async with SessionLocal(bind=replica.engine if replica else engine) as db:
+        try:
+            yield db
+        except exc.DBAPIError as e:
+            if replica and e.connection_invalidated:
+                replica_router.mark_unhealthy(replica)
+            raise
@@ -1,7 +1,7 @@
 from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum as SQLAlchemyEnum, JSON
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum as SQLAlchemyEnum, JSON, Index, text
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -38,6 +38,20 @@ class Contribution(Base):
     token_distributions = relationship("TokenDistribution", back_populates="contribution")
     marketplace_item = relationship("MarketplaceItem", back_populates="contribution", uselist=False)
 
+    # Indexes matching the listing filters and (created_at, id) keyset order
+    __table_args__ = (
+        Index("ix_contributions_created_at_id", "created_at", "id"),
+        Index("ix_contributions_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_contributions_sector_id_created_at_id", "sector_id", "created_at", "id"),
+        Index("ix_contributions_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index(
+            "ix_contributions_pending_created_at_id",
+            "created_at",
+            "id",
+            postgresql_where=text("status = 'submitted'"),
+        ),
+    )
+
 
 class ContributionMetadata(Base):
     __tablename__ = "contribution_metadata"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -18,6 +18,10 @@ class ImpactRecord(Base):
     # Relationships
     contribution = relationship("Contribution", back_populates="impact_records")
 
+    __table_args__ = (
+        Index("ix_impact_records_contribution_id", "contribution_id", "id"),
+    )
+
 
 class TokenDistribution(Base):
     __tablename__ = "token_distributions"
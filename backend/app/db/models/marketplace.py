@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, Boolean, ForeignKey, String
+from sqlalchemy import Column, Integer, Float, Boolean, ForeignKey, String, Index, text
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -14,7 +14,11 @@ class MarketplaceItem(Base):
 
     # Relationships
     contribution = relationship("Contribution", back_populates="marketplace_item")
-    purchases = relationship("Purchase", back_populates="item")
+    purchases = relationship("Purchase", back_populates="item", passive_deletes=True)
+
+    __table_args__ = (
+        Index("ix_marketplace_items_active_id", "id", postgresql_where=text("active")),
+    )
 
 
 class Purchase(Base):
@@ -27,4 +31,9 @@ class Purchase(Base):
 
     # Relationships
     buyer = relationship("User", back_populates="purchases")
-    item = relationship("MarketplaceItem", back_populates="purchases")
\ No newline at end of file
+    item = relationship("MarketplaceItem", back_populates="purchases")
+
+    __table_args__ = (
+        Index("ix_purchases_buyer_id_id", "buyer_id", "id"),
+        Index("ix_purchases_item_id", "item_id"),
+    )
\ No newline at end of file
@@ -1,4 +1,5 @@
 from sqlalchemy import Column, Integer, String, JSON
+from sqlalchemy.orm import relationship
 
 from app.db.base import Base
 
@@ -9,4 +10,7 @@ class Sector(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, index=True, nullable=False)
     metadata_schema = Column(JSON, nullable=False)  # JSON schema for contribution metadata
-    verification_policy = Column(JSON, nullable=False)  # Verification requirements
\ No newline at end of file
+    verification_policy = Column(JSON, nullable=False)  # Verification requirements
+
+    # Relationships (sectors in use are never deleted, so skip loading on delete)
+    contributions = relationship("Contribution", back_populates="sector", passive_deletes=True)
\ No newline at end of file
@@ -1,7 +1,7 @@
 from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import Column, Integer, String, JSON, DateTime, ForeignKey, Enum as SQLAlchemyEnum
+from sqlalchemy import Column, Integer, String, JSON, DateTime, ForeignKey, Enum as SQLAlchemyEnum, Index, text
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -34,6 +34,14 @@ class OnchainTransaction(Base):
     # Relationships
     user = relationship("User", back_populates="transactions")
 
+    __table_args__ = (
+        Index(
+            "ix_onchain_transactions_pending_created_at",
+            "created_at",
+            postgresql_where=text("status = 'pending'"),
+        ),
+    )
+
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
@@ -47,4 +55,8 @@ class AuditLog(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     # Relationships
-    actor = relationship("User", back_populates="audit_logs")
\ No newline at end of file
+    actor = relationship("User", back_populates="audit_logs")
+
+    __table_args__ = (
+        Index("ix_audit_logs_entity_entity_id", "entity", "entity_id"),
+    )
\ No newline at end of file
@@ -29,6 +29,8 @@ class User(Base):
     reputation = Column(Integer, default=0)
     kyc_status = Column(SQLAlchemyEnum(KYCStatus), default=KYCStatus.NONE, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Bumped when the role changes, invalidating role claims in issued tokens
+    token_version = Column(Integer, default=0, server_default="0", nullable=False)
     
     # Relationships
     contributions = relationship("Contribution", back_populates="user")
@@ -0,0 +1,83 @@
+import time
+from bisect import bisect_left
+from threading import Lock
+from typing import Any, Dict, Sequence
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+# Upper bounds (seconds) of the checkout wait time histogram buckets
+WAIT_TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class WaitTimeHistogram:
+    """Cumulative histogram of durations in seconds (e.g. connection checkout waits)."""
+
+    def __init__(self, buckets: Sequence[float] = WAIT_TIME_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.total = 0.0
+        self._lock = Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self.counts[bisect_left(self.buckets, seconds)] += 1
+            self.count += 1
+            self.total += seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = list(self.counts)
+            count, total = self.count, self.total
+
+        buckets = {}
+        running = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            running += bucket_count
+            buckets[str(bound)] = running
+        buckets["+Inf"] = count
+
+        return {"count": count, "sum": total, "buckets": buckets}
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records checkout wait times and checkout timeouts."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_times = WaitTimeHistogram()
+        self.timeouts = 0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.wait_times.observe(time.perf_counter() - start)
+
+
+def get_pool_stats(engine: AsyncEngine) -> Dict[str, Any]:
+    """Return a snapshot of the engine's connection pool usage."""
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {"status": pool.status()}
+
+    stats = {
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "timeout": pool.timeout(),
+    }
+    if isinstance(pool, InstrumentedQueuePool):
+        stats["timeouts"] = pool.timeouts
+        stats["wait_time"] = pool.wait_times.snapshot()
+
+    return stats
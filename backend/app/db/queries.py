@@ -0,0 +1,75 @@
+from typing import Any, Dict, Optional, Type, TypeVar
+
+from sqlalchemy import lambda_stmt, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.base import Base
+from app.db.models import Contribution, MarketplaceItem, Sector, User, UserRole
+
+
+ModelType = TypeVar("ModelType", bound=Base)
+
+
+# Hot lookups are built as lambda statements: SQLAlchemy caches the compiled
+# SQL keyed on the lambda's code, so each call only binds new parameters
+# instead of rebuilding and compiling the statement. With a statement cache
+# on the asyncpg connection the server-side prepared plan is reused too.
+
+async def get_user_by_wallet(db: AsyncSession, wallet: str) -> Optional[User]:
+    return await db.scalar(lambda_stmt(lambda: select(User).where(User.wallet == wallet)))
+
+
+async def get_or_create_user(db: AsyncSession, wallet: str) -> User:
+    """Return the user for a wallet, creating it on first login.
+
+    New users are provisioned with INSERT ... ON CONFLICT DO NOTHING RETURNING,
+    so concurrent first logins from the same wallet never hit a unique
+    violation: the loser gets no row back and selects the winner's. Existing
+    users, the common case, are found by the initial SELECT alone.
+    """
+    user = await get_user_by_wallet(db, wallet)
+    if user:
+        return user
+
+    insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    user = await db.scalar(
+        insert(User)
+        .values(wallet=wallet, role=UserRole.USER)
+        .on_conflict_do_nothing(index_elements=[User.wallet])
+        .returning(User)
+    )
+    if user is None:
+        user = await get_user_by_wallet(db, wallet)
+    return user
+
+
+async def get_contribution_by_id(db: AsyncSession, contribution_id: int) -> Optional[Contribution]:
+    return await db.scalar(
+        lambda_stmt(lambda: select(Contribution).where(Contribution.id == contribution_id))
+    )
+
+
+async def get_marketplace_item_by_id(db: AsyncSession, item_id: int) -> Optional[MarketplaceItem]:
+    return await db.scalar(
+        lambda_stmt(lambda: select(MarketplaceItem).where(MarketplaceItem.id == item_id))
+    )
+
+
+async def get_sector_by_id(db: AsyncSession, sector_id: int) -> Optional[Sector]:
+    return await db.scalar(lambda_stmt(lambda: select(Sector).where(Sector.id == sector_id)))
+
+
+async def update_returning(
+    db: AsyncSession, model: Type[ModelType], id: int, values: Dict[str, Any]
+) -> Optional[ModelType]:
+    """UPDATE a row by id and return it from RETURNING in a single round trip.
+
+    Returns None when no row has the given id.
+    """
+    if not values:
+        return await db.get(model, id)
+
+    return await db.scalar(
+        update(model).where(model.id == id).values(**values).returning(model)
+    )
@@ -0,0 +1,94 @@
+import asyncio
+import itertools
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.db.pool import get_pool_stats
+
+
+# Seconds the replica is behind the primary; zero when it has replayed
+# everything it received, so an idle primary does not look like lag
+REPLICATION_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+@dataclass
+class Replica:
+    engine: AsyncEngine
+    healthy: bool = True
+    lag: Optional[float] = None
+    checked_at: float = 0.0
+
+
+class ReplicaRouter:
+    """Round-robin read replica selection with health and lag checks."""
+
+    def __init__(
+        self,
+        engines: List[AsyncEngine],
+        max_lag: float,
+        check_interval: float,
+        check_timeout: float = 2.0,
+    ):
+        self.replicas = [Replica(engine=engine) for engine in engines]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.check_timeout = check_timeout
+        self.fallbacks = 0
+        self._cycle = itertools.cycle(self.replicas) if self.replicas else None
+
+    async def _fetch_lag(self, replica: Replica) -> Optional[float]:
+        async with replica.engine.connect() as conn:
+            return await conn.scalar(REPLICATION_LAG_QUERY)
+
+    async def _check(self, replica: Replica) -> None:
+        # Claim the check before awaiting so concurrent requests don't pile on
+        replica.checked_at = time.monotonic()
+        try:
+            lag = await asyncio.wait_for(self._fetch_lag(replica), self.check_timeout)
+            replica.lag = float(lag or 0)
+            replica.healthy = replica.lag <= self.max_lag
+        except Exception as e:
+            print(f"Read replica {replica.engine.url.host} unavailable: {e}")
+            replica.lag = None
+            replica.healthy = False
+
+    async def choose(self) -> Optional[Replica]:
+        """Return the next healthy replica, or None to fall back to the primary."""
+        if not self._cycle:
+            return None
+
+        for _ in range(len(self.replicas)):
+            replica = next(self._cycle)
+            if time.monotonic() - replica.checked_at >= self.check_interval:
+                await self._check(replica)
+            if replica.healthy:
+                return replica
+
+        self.fallbacks += 1
+        return None
+
+    def mark_unhealthy(self, replica: Replica) -> None:
+        replica.healthy = False
+        replica.checked_at = time.monotonic()
+
+    def stats(self) -> List[dict]:
+        return [
+            {
+                "host": replica.engine.url.host,
+                "healthy": replica.healthy,
+                "lag": replica.lag,
+                "pool": get_pool_stats(replica.engine),
+            }
+            for replica in self.replicas
+        ]
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.engine.dispose()
@@ -6,7 +6,8 @@ from app.db.schemas.sectors import (
 )
 from app.db.schemas.contributions import (
     Contribution, ContributionCreate, ContributionUpdate, ContributionInDB,
-    ContributionMetadataBase, ContributionVerify, ContributionWithMetadata
+    ContributionMetadataBase, ContributionVerify, ContributionWithMetadata,
+    ContributionImport, ContributionImportError, ContributionImportResult
 )
 from app.db.schemas.impact import (
     ImpactRecord, ImpactRecordCreate, ImpactRecordUpdate, ImpactRecordInDB,
@@ -75,4 +75,25 @@ class ContributionWithMetadata(BaseModel):
 # Schema for contribution verification
 class ContributionVerify(BaseModel):
     approved: bool
-    feedback: Optional[str] = None
\ No newline at end of file
+    feedback: Optional[str] = None
+
+
+# Schema for one row of a bulk contribution import
+class ContributionImport(ContributionBase):
+    user_id: int
+    sector_id: int
+    status: ContributionStatus = ContributionStatus.SUBMITTED
+    metadata: Dict[str, Any] = Field(default_factory=dict, description="Metadata according to sector schema")
+
+
+# Schema for a rejected bulk import row
+class ContributionImportError(BaseModel):
+    row: int
+    error: str
+
+
+# Schema for a bulk import report
+class ContributionImportResult(BaseModel):
+    imported: int = 0
+    failed: int = 0
+    errors: List[ContributionImportError] = []
@@ -1,13 +1,37 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.rate_limit import RATE_LIMIT_HEADERS
+from app.core.redis import close_redis, get_redis
 from app.api.v1.router import api_router
+from app.db.base import engine, replica_router
+from app.services.ipfs import ipfs_client
+from app.services.siwe_verifier import siwe_verifier
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Create the Redis pool shared by rate limits, nonces and caches
+    get_redis()
+    await ipfs_client.start()
+    yield
+    # Close pooled database, Redis and IPFS connections on shutdown
+    await engine.dispose()
+    await replica_router.dispose()
+    await close_redis()
+    await ipfs_client.close()
+    siwe_verifier.shutdown()
+
 
 app = FastAPI(
     title="ContriBlock API",
     description="Blockchain-based contribution mining & exchange platform",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Set up CORS
@@ -18,6 +42,7 @@ if settings.CORS_ORIGINS:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, *RATE_LIMIT_HEADERS],
     )
 
 # Include API router
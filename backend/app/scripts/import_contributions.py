@@ -0,0 +1,41 @@
+"""Bulk-import contributions from an NDJSON or CSV file.
+
+Usage:
+    python -m app.scripts.import_contributions contributions.ndjson
+    python -m app.scripts.import_contributions contributions.csv --batch-size 5000
+"""
+import argparse
+import asyncio
+import json
+import sys
+
+from app.db.base import SessionLocal, engine
+from app.services.bulk_import import (
+    IMPORT_BATCH_SIZE,
+    ContributionImporter,
+    ImportFormat,
+    detect_format,
+    iter_file_lines,
+    iter_records,
+)
+
+
+async def main(path: str, fmt: ImportFormat, batch_size: int) -> int:
+    async with SessionLocal() as db:
+        importer = ContributionImporter(db, batch_size=batch_size)
+        result = await importer.run(iter_records(iter_file_lines(path), fmt))
+    await engine.dispose()
+
+    print(json.dumps(result.model_dump(), indent=2))
+    return 1 if result.failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-import contributions")
+    parser.add_argument("path", help="NDJSON or CSV file to import")
+    parser.add_argument("--format", choices=[f.value for f in ImportFormat], help="Input format (default: from file extension)")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE, help="Rows per transaction")
+    args = parser.parse_args()
+
+    fmt = ImportFormat(args.format) if args.format else detect_format(args.path)
+    sys.exit(asyncio.run(main(args.path, fmt, args.batch_size)))
@@ -0,0 +1,261 @@
+import codecs
+import csv
+import json
+from collections import deque
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from fastapi import UploadFile
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Contribution, ContributionMetadata, Sector, User
+from app.db.schemas import ContributionImport, ContributionImportError, ContributionImportResult
+
+
+IMPORT_BATCH_SIZE = 1000  # Rows validated and inserted per transaction
+MAX_REPORTED_ERRORS = 1000  # Failed rows beyond this are counted but not listed
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class ImportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+def detect_format(filename: Optional[str]) -> ImportFormat:
+    """Pick the import format from a file name, defaulting to NDJSON."""
+    if filename and filename.lower().endswith(".csv"):
+        return ImportFormat.CSV
+    return ImportFormat.NDJSON
+
+
+async def iter_upload_lines(file: UploadFile) -> AsyncIterator[str]:
+    """Yield decoded lines from an upload without reading it all into memory."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def iter_file_lines(path: str) -> AsyncIterator[str]:
+    """Yield lines from a local file (used by the import CLI)."""
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        for line in f:
+            yield line
+
+
+class _LineBuffer:
+    """Sync line iterator for csv.reader, filled from an async source.
+
+    When it runs dry it ends iteration and sets `starved`; the lines of the
+    record being parsed are kept in `record` so they can be pushed back and
+    parsed again once more input has been read.
+    """
+
+    def __init__(self):
+        self.lines: deque = deque()
+        self.record: List[str] = []
+        self.starved = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            self.starved = True
+            raise StopIteration
+        line = self.lines.popleft()
+        self.record.append(line)
+        return line
+
+
+async def iter_csv_rows(lines: AsyncIterator[str]) -> AsyncIterator[Union[List[str], str]]:
+    """Parse CSV rows from async lines with csv.reader, which handles quoting.
+
+    Rows that cannot be parsed, including a quoted field still open at the
+    end of the input, are yielded as an error message.
+    """
+    buffer = _LineBuffer()
+    reader = csv.reader(buffer)
+    lines = lines.__aiter__()
+    exhausted = False
+    want = 1
+    while True:
+        buffer.record = []
+        buffer.starved = False
+        try:
+            values = next(reader, None)
+        except csv.Error as e:
+            yield f"Invalid CSV: {e}"
+            continue
+
+        if not buffer.starved:
+            want = 1
+            yield values
+            continue
+
+        # Ran out of input, possibly in the middle of a record
+        if exhausted:
+            if "".join(buffer.record).strip():
+                yield "Invalid CSV: unterminated quoted field"
+            return
+        # Re-parse the partial record with more lines; doubling the read
+        # keeps long multi-line records from being parsed line by line
+        buffer.lines.extendleft(reversed(buffer.record))
+        if buffer.record:
+            want *= 2
+        for _ in range(want):
+            try:
+                buffer.lines.append(await lines.__anext__())
+            except StopAsyncIteration:
+                exhausted = True
+                break
+
+
+async def iter_records(
+    lines: AsyncIterator[str], fmt: ImportFormat
+) -> AsyncIterator[Tuple[int, Union[Dict[str, Any], str]]]:
+    """Parse input lines into (row number, record) pairs.
+
+    Rows that cannot be parsed are yielded with an error message in place of
+    the record so the importer can report them and carry on.
+    """
+    if fmt == ImportFormat.NDJSON:
+        row = 0
+        async for line in lines:
+            if not line.strip():
+                continue
+            row += 1
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield row, f"Invalid JSON: {e}"
+                continue
+            if not isinstance(record, dict):
+                yield row, "Expected a JSON object"
+                continue
+            yield row, record
+        return
+
+    header: Optional[List[str]] = None
+    row = 0
+    async for values in iter_csv_rows(lines):
+        if isinstance(values, str):
+            row += 1
+            yield row, values
+            continue
+        if not "".join(values).strip():
+            continue
+
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+
+        row += 1
+        if len(values) != len(header):
+            yield row, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        record: Dict[str, Any] = {
+            name: value for name, value in zip(header, values) if value != ""
+        }
+        if "metadata" in record:
+            try:
+                record["metadata"] = json.loads(record["metadata"])
+            except json.JSONDecodeError as e:
+                yield row, f"Invalid metadata JSON: {e}"
+                continue
+        yield row, record
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}"
+        for item in error.errors()
+    )
+
+
+class ContributionImporter:
+    """Validate contribution rows in batches and insert them with multi-row INSERTs."""
+
+    def __init__(self, db: AsyncSession, batch_size: int = IMPORT_BATCH_SIZE):
+        self.db = db
+        self.batch_size = batch_size
+        self.result = ContributionImportResult()
+
+    def _fail(self, row: int, error: str) -> None:
+        self.result.failed += 1
+        if len(self.result.errors) < MAX_REPORTED_ERRORS:
+            self.result.errors.append(ContributionImportError(row=row, error=error))
+
+    async def run(
+        self, records: AsyncIterator[Tuple[int, Union[Dict[str, Any], str]]]
+    ) -> ContributionImportResult:
+        batch: List[Tuple[int, ContributionImport]] = []
+        async for row, record in records:
+            if isinstance(record, str):
+                self._fail(row, record)
+                continue
+            try:
+                batch.append((row, ContributionImport.model_validate(record)))
+            except ValidationError as e:
+                self._fail(row, _validation_message(e))
+                continue
+
+            if len(batch) >= self.batch_size:
+                await self._write_batch(batch)
+                batch = []
+
+        if batch:
+            await self._write_batch(batch)
+        return self.result
+
+    async def _write_batch(self, batch: List[Tuple[int, ContributionImport]]) -> None:
+        # Resolve every foreign key in the batch with one query per table
+        sector_ids = {item.sector_id for _, item in batch}
+        user_ids = {item.user_id for _, item in batch}
+        known_sectors = set(await self.db.scalars(select(Sector.id).where(Sector.id.in_(sector_ids))))
+        known_users = set(await self.db.scalars(select(User.id).where(User.id.in_(user_ids))))
+
+        valid: List[Tuple[int, ContributionImport]] = []
+        for row, item in batch:
+            if item.sector_id not in known_sectors:
+                self._fail(row, f"Sector {item.sector_id} not found")
+            elif item.user_id not in known_users:
+                self._fail(row, f"User {item.user_id} not found")
+            else:
+                valid.append((row, item))
+
+        if not valid:
+            return
+
+        try:
+            contribution_ids = (
+                await self.db.scalars(
+                    insert(Contribution).returning(Contribution.id, sort_by_parameter_order=True),
+                    [item.model_dump(exclude={"metadata"}) for _, item in valid],
+                )
+            ).all()
+            await self.db.execute(
+                insert(ContributionMetadata),
+                [
+                    {"contribution_id": contribution_id, "data": item.metadata}
+                    for contribution_id, (_, item) in zip(contribution_ids, valid)
+                ],
+            )
+            await self.db.commit()
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            for row, _ in valid:
+                self._fail(row, f"Database error: {e.__class__.__name__}")
+            return
+
+        self.result.imported += len(valid)
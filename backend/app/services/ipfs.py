@@ -1,12 +1,84 @@
+from typing import Optional, Dict, Any, AsyncIterator, BinaryIO, Protocol
+
 import aiohttp
-from typing import Optional, Dict, Any, BinaryIO
+from aiohttp.payload import AsyncIterablePayload
 
 from app.core.config import settings
+from app.core.disk_cache import DiskCache
+
+
+# Bytes read from an upload per chunk; bounds memory per streaming upload
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+# Bytes yielded per chunk when streaming a download
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+
+class AsyncReader(Protocol):
+    async def read(self, size: int = -1) -> bytes: ...
+
+
+class IPFSError(Exception):
+    """Raised when the IPFS API rejects a streaming request."""
+
+
+class UploadTooLargeError(Exception):
+    """Raised when a streamed upload exceeds IPFS_MAX_UPLOAD_SIZE."""
+
+
+class LimitedStream:
+    """Async iterator over a reader's chunks that stops past `max_size` bytes."""
+
+    def __init__(self, reader: AsyncReader, chunk_size: int = UPLOAD_CHUNK_SIZE, max_size: Optional[int] = None):
+        self.reader = reader
+        self.chunk_size = chunk_size
+        self.max_size = max_size
+        self.size = 0
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        while True:
+            chunk = await self.reader.read(self.chunk_size)
+            if not chunk:
+                return
+            self.size += len(chunk)
+            if self.max_size is not None and self.size > self.max_size:
+                raise UploadTooLargeError(f"Upload exceeds {self.max_size} bytes")
+            yield chunk
 
 
 class IPFSClient:
     def __init__(self):
         self.api_url = settings.IPFS_API_URL
+        self.session: Optional[aiohttp.ClientSession] = None
+        # CIDs are immutable, so cached files never need invalidating
+        self.cache = DiskCache(
+            settings.IPFS_CACHE_DIR,
+            max_bytes=settings.IPFS_CACHE_MAX_BYTES,
+            max_item_size=settings.IPFS_CACHE_MAX_FILE_SIZE,
+            chunk_size=DOWNLOAD_CHUNK_SIZE,
+        )
+    
+    async def start(self):
+        """Open the pooled session and disk cache; called from the app lifespan."""
+        self.cache.open()
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=settings.IPFS_MAX_CONNECTIONS,
+                keepalive_timeout=settings.IPFS_KEEPALIVE_TIMEOUT,
+            )
+            self.session = aiohttp.ClientSession(connector=connector)
+    
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+    
+    async def get_session(self) -> aiohttp.ClientSession:
+        # Opened lazily for callers outside the app (scripts, tests)
+        await self.start()
+        return self.session
+    
+    def timeout(self, total: float) -> aiohttp.ClientTimeout:
+        return aiohttp.ClientTimeout(total=total, connect=settings.IPFS_CONNECT_TIMEOUT)
     
     async def add_file(self, file_content: BinaryIO, filename: str) -> Optional[str]:
         """Add a file to IPFS and return its CID."""
@@ -22,46 +94,160 @@ class IPFSClient:
                 content_type="application/octet-stream"
             )
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, data=form_data) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        return result.get("Hash")
-                    else:
-                        print(f"Error adding file to IPFS: {await response.text()}")
-                        return None
+            session = await self.get_session()
+            async with session.post(
+                url, data=form_data, timeout=self.timeout(settings.IPFS_ADD_TIMEOUT)
+            ) as response:
+                if response.status == 200:
+                    result = await response.json()
+                    return result.get("Hash")
+                else:
+                    print(f"Error adding file to IPFS: {await response.text()}")
+                    return None
         except Exception as e:
             print(f"Error adding file to IPFS: {e}")
             return None
     
+    async def add_stream(self, reader: AsyncReader, filename: str) -> Optional[str]:
+        """Stream a file to IPFS chunk by chunk and return its CID.
+
+        `reader` is anything with an async read(size), such as an UploadFile.
+        Chunks are written to the request body as they are read, and the
+        next chunk isn't read until the previous one has been sent, so
+        memory use doesn't grow with the file size.
+        """
+        stream = LimitedStream(reader, max_size=settings.IPFS_MAX_UPLOAD_SIZE)
+        try:
+            url = f"{self.api_url}/api/v0/add"
+            
+            with aiohttp.MultipartWriter("form-data") as form_data:
+                part = form_data.append_payload(
+                    AsyncIterablePayload(stream, content_type="application/octet-stream")
+                )
+                part.set_content_disposition("form-data", name="file", filename=filename)
+            
+            session = await self.get_session()
+            async with session.post(
+                url, data=form_data, timeout=self.timeout(settings.IPFS_ADD_TIMEOUT)
+            ) as response:
+                if response.status == 200:
+                    result = await response.json()
+                    return result.get("Hash")
+                else:
+                    print(f"Error adding file to IPFS: {await response.text()}")
+                    return None
+        except UploadTooLargeError:
+            raise
+        except Exception as e:
+            if isinstance(e.__cause__, UploadTooLargeError):
+                raise e.__cause__
+            print(f"Error adding file to IPFS: {e}")
+            return None
+    
     async def get_file(self, cid: str) -> Optional[bytes]:
-        """Get a file from IPFS by its CID."""
+        """Get a file from IPFS by its CID, served from the disk cache when possible."""
         try:
             url = f"{self.api_url}/api/v0/cat?arg={cid}"
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url) as response:
-                    if response.status == 200:
-                        return await response.read()
-                    else:
-                        print(f"Error getting file from IPFS: {await response.text()}")
-                        return None
+            session = await self.get_session()
+            cached = await self.cache.read(cid)
+            if cached is not None:
+                return cached
+            
+            async with session.post(url, timeout=self.timeout(settings.IPFS_GET_TIMEOUT)) as response:
+                if response.status == 200:
+                    data = await response.read()
+                    await self.cache.put(cid, data)
+                    return data
+                else:
+                    print(f"Error getting file from IPFS: {await response.text()}")
+                    return None
         except Exception as e:
             print(f"Error getting file from IPFS: {e}")
             return None
     
+    async def get_size(self, cid: str) -> Optional[int]:
+        """Return the size in bytes of the file behind a CID, or None if unavailable."""
+        size = self.cache.get_size(cid)
+        if size is not None:
+            return size
+        
+        try:
+            url = f"{self.api_url}/api/v0/files/stat"
+            
+            session = await self.get_session()
+            async with session.post(
+                url, params={"arg": f"/ipfs/{cid}"}, timeout=self.timeout(settings.IPFS_GET_TIMEOUT)
+            ) as response:
+                if response.status == 200:
+                    result = await response.json()
+                    return int(result["Size"])
+                else:
+                    print(f"Error getting file size from IPFS: {await response.text()}")
+                    return None
+        except Exception as e:
+            print(f"Error getting file size from IPFS: {e}")
+            return None
+    
+    async def iter_file(
+        self, cid: str, offset: int = 0, length: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        """Stream a file (or `length` bytes of it from `offset`) from IPFS.
+
+        Cached files are read from a memory map of the local copy. Otherwise
+        chunks are yielded as they arrive, so memory use doesn't depend on
+        the file size, and a complete download is written to the cache.
+        Raises IPFSError if the daemon rejects the request.
+        """
+        session = await self.get_session()
+        mm = self.cache.open_mmap(cid)
+        if mm is not None:
+            async for chunk in self.cache.iter_mmap(mm, offset, length):
+                yield chunk
+            return
+        
+        url = f"{self.api_url}/api/v0/cat"
+        params = {"arg": cid}
+        if offset:
+            params["offset"] = str(offset)
+        if length is not None:
+            params["length"] = str(length)
+        
+        # No total timeout: a large download may legitimately take long, but
+        # a stalled one fails after IPFS_READ_TIMEOUT without data
+        timeout = aiohttp.ClientTimeout(
+            total=None, connect=settings.IPFS_CONNECT_TIMEOUT, sock_read=settings.IPFS_READ_TIMEOUT
+        )
+        # Only whole-file reads can populate the cache
+        writer = self.cache.writer(cid) if not offset and length is None else None
+        try:
+            async with session.post(url, params=params, timeout=timeout) as response:
+                if response.status != 200:
+                    raise IPFSError(f"Error getting file from IPFS: {await response.text()}")
+                async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                    if writer is not None:
+                        await writer.write(chunk)
+                    yield chunk
+        except BaseException:
+            # Failed or abandoned by the client: never cache a partial file
+            if writer is not None:
+                writer.abort()
+            raise
+        if writer is not None:
+            await writer.commit()
+    
     async def pin_file(self, cid: str) -> bool:
         """Pin a file in IPFS to prevent garbage collection."""
         try:
             url = f"{self.api_url}/api/v0/pin/add?arg={cid}"
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url) as response:
-                    if response.status == 200:
-                        return True
-                    else:
-                        print(f"Error pinning file in IPFS: {await response.text()}")
-                        return False
+            session = await self.get_session()
+            async with session.post(url, timeout=self.timeout(settings.IPFS_PIN_TIMEOUT)) as response:
+                if response.status == 200:
+                    return True
+                else:
+                    print(f"Error pinning file in IPFS: {await response.text()}")
+                    return False
         except Exception as e:
             print(f"Error pinning file in IPFS: {e}")
             return False
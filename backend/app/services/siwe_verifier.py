@@ -0,0 +1,92 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from siwe import SiweMessage
+
+from app.core.config import settings
+from app.db.pool import WaitTimeHistogram
+
+
+def verify_siwe_message(message: str, signature: str) -> bool:
+    """Verify a SIWE message and signature."""
+    try:
+        siwe_message = SiweMessage(message=message)
+        return siwe_message.verify(signature=signature)
+    except Exception as e:
+        print(f"Error verifying SIWE message: {e}")
+        return False
+
+
+class VerifierBusyError(Exception):
+    """Raised when the verification queue is full."""
+
+
+class SiweVerifier:
+    """Runs SIWE verification off the event loop in a bounded worker pool.
+
+    Parsing the message and recovering the signer's public key is CPU-bound,
+    so running it inline in the route stalls every other request during a
+    login burst. Calls beyond the busy workers plus max_queue are rejected
+    rather than queued without bound.
+    """
+
+    def __init__(self, workers: int, max_queue: int, use_processes: bool = False):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.use_processes = use_processes
+        self.pending = 0
+        self.rejected = 0
+        self.latency = WaitTimeHistogram()
+        self._executor: Optional[Executor] = None
+
+    @property
+    def executor(self) -> Executor:
+        # Created lazily so importing the app doesn't start workers
+        if self._executor is None:
+            if self.use_processes:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="siwe-verify"
+                )
+        return self._executor
+
+    async def verify(self, message: str, signature: str) -> bool:
+        if self.pending >= self.workers + self.max_queue:
+            self.rejected += 1
+            raise VerifierBusyError("SIWE verification queue is full")
+
+        self.pending += 1
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self.executor, verify_siwe_message, message, signature
+            )
+        finally:
+            self.pending -= 1
+            self.latency.observe(time.perf_counter() - start)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "in_flight": min(self.pending, self.workers),
+            "queue_depth": max(self.pending - self.workers, 0),
+            "max_queue": self.max_queue,
+            "rejected": self.rejected,
+            "latency": self.latency.snapshot(),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+siwe_verifier = SiweVerifier(
+    workers=settings.SIWE_VERIFY_WORKERS,
+    max_queue=settings.SIWE_VERIFY_MAX_QUEUE,
+    use_processes=settings.SIWE_VERIFY_USE_PROCESSES,
+)
@@ -3,9 +3,9 @@ from typing import Optional, Dict, Any
 import json
 from web3 import Web3
 from eth_account.messages import encode_defunct
-from siwe import SiweMessage
 
 from app.core.config import settings
+from app.services.siwe_verifier import verify_siwe_message
 
 
 class Web3Client:
@@ -41,13 +41,11 @@ class Web3Client:
             print(f"Error loading contracts: {e}")
     
     def verify_siwe_message(self, message: str, signature: str) -> bool:
-        """Verify a SIWE message and signature."""
-        try:
-            siwe_message = SiweMessage(message=message)
-            return siwe_message.verify(signature=signature)
-        except Exception as e:
-            print(f"Error verifying SIWE message: {e}")
-            return False
+        """Verify a SIWE message and signature.
+
+        Blocks on signature recovery; async code should use siwe_verifier.
+        """
+        return verify_siwe_message(message, signature)
     
     def get_balance(self, address: str) -> int:
         """Get the CTR token balance of an address."""
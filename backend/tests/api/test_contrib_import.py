@@ -0,0 +1,115 @@
+import json
+from io import BytesIO
+
+import pytest
+
+from app.core.security import create_access_token
+from app.db.models import Contribution, ContributionMetadata, Sector, User, UserRole
+
+
+def get_auth_header(user):
+    """Helper function to create authorization header."""
+    token = create_access_token(subject=user.wallet)
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def import_admin(db_session):
+    """Create an admin allowed to run imports."""
+    admin = User(wallet="0x0987654321098765432109876543210987654321", role=UserRole.ADMIN)
+    db_session.add(admin)
+    db_session.commit()
+    db_session.refresh(admin)
+    return admin
+
+
+@pytest.fixture
+def import_sector(db_session):
+    """Create a sector to import contributions into."""
+    sector = Sector(name="Import Sector", metadata_schema={}, verification_policy={})
+    db_session.add(sector)
+    db_session.commit()
+    db_session.refresh(sector)
+    return sector
+
+
+def contribution_row(user_id, sector_id, **overrides):
+    row = {
+        "user_id": user_id,
+        "sector_id": sector_id,
+        "title": "Imported Contribution",
+        "abstract": "Imported abstract",
+        "ipfs_cid": "test_ipfs_hash",
+        "metadata": {"source": "partner"},
+    }
+    row.update(overrides)
+    return row
+
+
+def test_import_contributions_ndjson(client, db_session, import_admin, import_sector):
+    """Test importing contributions from NDJSON with per-row errors."""
+    rows = [
+        contribution_row(import_admin.id, import_sector.id),
+        contribution_row(import_admin.id, 9999),
+        {"title": "Missing fields"},
+        contribution_row(import_admin.id, import_sector.id, title="Second"),
+    ]
+    body = "\n".join(json.dumps(row) for row in rows) + "\nnot json\n"
+
+    response = client.post(
+        "/api/v1/contrib/import",
+        files={"file": ("contributions.ndjson", BytesIO(body.encode()), "application/x-ndjson")},
+        headers=get_auth_header(import_admin),
+    )
+
+    assert response.status_code == 200
+    assert response.json()["imported"] == 2
+    assert response.json()["failed"] == 3
+    assert sorted(error["row"] for error in response.json()["errors"]) == [2, 3, 5]
+    assert db_session.query(Contribution).count() == 2
+    assert db_session.query(ContributionMetadata).count() == 2
+
+
+def test_import_contributions_csv(client, db_session, import_admin, import_sector):
+    """Test importing contributions from CSV, including a multi-line field."""
+    body = (
+        "user_id,sector_id,title,abstract,ipfs_cid,metadata\n"
+        f'{import_admin.id},{import_sector.id},CSV One,"Line one\nline two",cid1,"{{""a"": 1}}"\n'
+        f"{import_admin.id},{import_sector.id},CSV Two,Abstract,cid2,\n"
+    )
+
+    response = client.post(
+        "/api/v1/contrib/import",
+        files={"file": ("contributions.csv", BytesIO(body.encode()), "text/csv")},
+        headers=get_auth_header(import_admin),
+    )
+
+    assert response.status_code == 200
+    assert response.json()["imported"] == 2
+    assert response.json()["failed"] == 0
+    abstracts = {c.abstract for c in db_session.query(Contribution).all()}
+    assert "Line one\nline two" in abstracts
+
+
+def test_import_contributions_csv_unbalanced_quotes(client, db_session, import_admin, import_sector):
+    """Test that stray quotes don't swallow later rows and an open quote is reported."""
+    body = (
+        "user_id,sector_id,title,abstract,ipfs_cid\n"
+        f'{import_admin.id},{import_sector.id},A 5" disk,Abstract,cid1\n'
+        f"{import_admin.id},{import_sector.id},After,Abstract,cid2\n"
+        f'{import_admin.id},{import_sector.id},"Never closed,Abstract,cid3\n'
+        f"{import_admin.id},{import_sector.id},Swallowed,Abstract,cid4\n"
+    )
+
+    response = client.post(
+        "/api/v1/contrib/import",
+        files={"file": ("contributions.csv", BytesIO(body.encode()), "text/csv")},
+        headers=get_auth_header(import_admin),
+    )
+
+    assert response.status_code == 200
+    assert response.json()["imported"] == 2
+    assert response.json()["failed"] == 1
+    assert response.json()["errors"][0]["row"] == 3
+    titles = {c.title for c in db_session.query(Contribution).all()}
+    assert titles == {'A 5" disk', "After"}
@@ -1,7 +1,10 @@
 import pytest
 from unittest.mock import patch
 
+from app.core.pagination import encode_cursor
 from app.core.security import create_access_token
+from app.core.user_cache import user_cache
+from app.db.models import User, UserRole, KYCStatus
 
 
 def get_auth_header(user):
@@ -10,6 +13,30 @@ def get_auth_header(user):
     return {"Authorization": f"Bearer {token}"}
 
 
+@pytest.fixture
+def users_admin(db_session):
+    """Create an admin allowed to manage users."""
+    admin = User(wallet="0x0987654321098765432109876543210987654321", role=UserRole.ADMIN)
+    db_session.add(admin)
+    db_session.commit()
+    db_session.refresh(admin)
+    return admin
+
+
+@pytest.fixture
+def kyc_user(db_session):
+    """Create a user whose KYC has been approved."""
+    user = User(
+        wallet="0x1234567890123456789012345678901234567890",
+        role=UserRole.USER,
+        kyc_status=KYCStatus.APPROVED,
+    )
+    db_session.add(user)
+    db_session.commit()
+    db_session.refresh(user)
+    return user
+
+
 def test_get_current_user_info(client, test_user):
     """Test getting current user information."""
     headers = get_auth_header(test_user)
@@ -126,4 +153,77 @@ def test_update_user_kyc_status_as_non_admin(client, test_user):
         headers=headers,
     )
     
-    assert response.status_code == 403
\ No newline at end of file
+    assert response.status_code == 403
+
+
+def test_update_user_kyc_status_refreshes_cached_user(client, kyc_user, users_admin):
+    """Test that a KYC change is visible to the user's next request."""
+    user_headers = get_auth_header(kyc_user)
+    
+    # Load the user into the cache
+    response = client.get("/api/v1/users/me", headers=user_headers)
+    assert response.json()["kyc_status"] == "approved"
+    
+    response = client.put(
+        f"/api/v1/users/{kyc_user.id}/kyc",
+        params={"kyc_status": "rejected"},
+        headers=get_auth_header(users_admin),
+    )
+    assert response.status_code == 200
+    
+    response = client.get("/api/v1/users/me", headers=user_headers)
+    assert response.status_code == 200
+    assert response.json()["kyc_status"] == "rejected"
+
+
+def test_update_user_role_revokes_role_claims(client, db_session, users_admin):
+    """Test that a demoted admin's token stops working on other workers."""
+    other_admin = User(
+        wallet="0x1111111111111111111111111111111111111111",
+        role=UserRole.ADMIN,
+        kyc_status=KYCStatus.APPROVED,
+    )
+    db_session.add(other_admin)
+    db_session.commit()
+    db_session.refresh(other_admin)
+    
+    # Token as issued at login, carrying the role and token version
+    token = create_access_token(
+        subject=other_admin.wallet,
+        extra_claims={"uid": other_admin.id, "role": "admin", "ver": other_admin.token_version},
+    )
+    other_headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/api/v1/users/", headers=other_headers).status_code == 200
+    
+    response = client.put(
+        f"/api/v1/users/{other_admin.id}/role",
+        params={"role": "user"},
+        headers=get_auth_header(users_admin),
+    )
+    assert response.status_code == 200
+    
+    # Another worker's user cache still holds the admin role
+    user_cache.cache.set(other_admin.wallet, {
+        "id": other_admin.id,
+        "wallet": other_admin.wallet,
+        "role": UserRole.ADMIN,
+        "reputation": 0,
+        "kyc_status": KYCStatus.APPROVED,
+        "created_at": other_admin.created_at,
+    })
+    
+    response = client.get("/api/v1/users/", headers=other_headers)
+    assert response.status_code == 403
+
+
+@pytest.mark.parametrize("values", [["1"], [[1]], [{"id": 1}], [True], [2 ** 40], []])
+def test_get_users_rejects_tampered_cursor(client, users_admin, values):
+    """Test that a cursor whose values don't match the sort key is a 400."""
+    response = client.get(
+        "/api/v1/users/",
+        params={"cursor": encode_cursor(values)},
+        headers=get_auth_header(users_admin),
+    )
+    
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
@@ -1,27 +1,44 @@
 import os
+import tempfile
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+# Rate limits need Redis and would throttle repeated test requests
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
 
 from app.main import app
-from app.core.deps import get_db
-from app.db.base import Base
+from app.core.deps import get_db, get_read_db, get_nonce_store
+from app.core.nonce_store import NonceStore
+from app.core.user_cache import user_cache
+from app.db.base import Base, get_async_database_url, raise_on_lazy_load
 from app.db.models import User, UserRole, KYCStatus, Sector
 
-# Use in-memory SQLite for tests
-TEST_DATABASE_URL = "sqlite:///:memory:"
+# Use a file-backed SQLite database so the sync fixtures and the async app
+# sessions see the same data
+TEST_DATABASE_URL = f"sqlite:///{os.path.join(tempfile.gettempdir(), 'contriblock_test.db')}"
 
-# Create test engine
+# Create test engines
 engine = create_engine(
     TEST_DATABASE_URL,
     connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
 )
+async_engine = create_async_engine(
+    get_async_database_url(TEST_DATABASE_URL),
+    poolclass=NullPool,
+)
+
+# Fail tests on implicit lazy loads so N+1 queries are caught early
+event.listen(Session, "do_orm_execute", raise_on_lazy_load)
 
-# Create test session
+# Create test sessions
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncTestingSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
 
 
 @pytest.fixture(scope="function")
@@ -41,22 +58,45 @@ def db_session():
     Base.metadata.drop_all(bind=engine)
 
 
+class InMemoryRedis:
+    """The subset of redis.asyncio.Redis used by token versions, kept in a dict."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = str(value)
+        return True
+
+
 @pytest.fixture(scope="function")
-def client(db_session):
+def client(db_session, monkeypatch):
     # Override the get_db dependency
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            pass
+    async def override_get_db():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
     
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    # Keep nonces in memory so tests don't need Redis
+    test_nonce_store = NonceStore(maxsize=100, ttl=300)
+    app.dependency_overrides[get_nonce_store] = lambda: test_nonce_store
+    # Token versions go through the Redis code path without a Redis server
+    test_redis = InMemoryRedis()
+    monkeypatch.setattr("app.core.token_versions.get_redis", lambda: test_redis)
     
     with TestClient(app) as test_client:
         yield test_client
     
     # Clear dependency override
     app.dependency_overrides.clear()
+    # Tables are recreated per test, so cached users would be stale
+    user_cache.cache.clear()
 
 
 @pytest.fixture(scope="function")
@@ -0,0 +1,30 @@
+import os
+import time
+
+from app.core.disk_cache import STALE_TMP_SECONDS, DiskCache
+
+
+def test_open_keeps_other_workers_temp_files(tmp_path):
+    """Test that opening the cache only removes abandoned temp files."""
+    live = tmp_path / "live.tmp"
+    dead = tmp_path / "dead.tmp"
+    live.write_bytes(b"partial")
+    dead.write_bytes(b"partial")
+    stale = time.time() - STALE_TMP_SECONDS - 60
+    os.utime(dead, (stale, stale))
+    
+    cache = DiskCache(str(tmp_path), max_bytes=1024, max_item_size=1024)
+    cache.open()
+    
+    assert live.exists()
+    assert not dead.exists()
+    assert cache.stats()["files"] == 0
+
+
+def test_disabled_when_max_bytes_is_zero(tmp_path):
+    """Test that a zero size limit turns the cache off."""
+    cache = DiskCache(str(tmp_path / "cache"), max_bytes=0, max_item_size=1024)
+    cache.open()
+    
+    assert not cache.enabled
+    assert cache.writer("QmTest") is None
@@ -0,0 +1,34 @@
+import pytest
+from fastapi import HTTPException
+
+from app.core.ranges import parse_range
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, None),
+        ("bytes=0-99", (0, 99)),
+        ("bytes=900-", (900, 999)),
+        ("bytes=900-5000", (900, 999)),
+        ("bytes=-100", (900, 999)),
+        ("bytes=-5000", (0, 999)),
+        # Invalid or multi-range headers are ignored: serve the whole file
+        ("bytes=500-100", None),
+        ("bytes=0-1,5-6", None),
+        ("items=0-1", None),
+    ],
+)
+def test_parse_range(header, expected):
+    """Test single byte ranges against a 1000-byte file."""
+    assert parse_range(header, 1000) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=1000-", "bytes=5000-6000", "bytes=-0"])
+def test_parse_range_unsatisfiable(header):
+    """Test ranges starting past the end of the file get 416."""
+    with pytest.raises(HTTPException) as excinfo:
+        parse_range(header, 1000)
+    
+    assert excinfo.value.status_code == 416
+    assert excinfo.value.headers["Content-Range"] == "bytes */1000"
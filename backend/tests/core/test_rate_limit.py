@@ -0,0 +1,166 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import rate_limit
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.config import settings
+from app.core.rate_limit import RateLimitAlgorithm, RateLimiter
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    """A fresh Redis circuit breaker, so tests don't share its state."""
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout=60)
+    monkeypatch.setattr(rate_limit, "redis_breaker", breaker)
+    return breaker
+
+
+@pytest.fixture
+def fake_redis(monkeypatch, breaker):
+    """Serve the limiter's Lua scripts from fakeredis instead of a server."""
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")  # Lua support for EVALSHA
+    redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+    monkeypatch.setattr(rate_limit, "get_redis", lambda: redis)
+    # Loading a script into fakeredis is slower than a real round trip
+    monkeypatch.setattr(settings, "RATE_LIMIT_REDIS_TIMEOUT", 5.0)
+    return redis
+
+
+def acquire_many(limiter, count, key="rate_limit:test", cost=1):
+    async def run():
+        return [await limiter.acquire(key, cost) for _ in range(count)]
+    return asyncio.run(run())
+
+
+def test_cancelled_half_open_trial_releases_breaker(monkeypatch):
+    """Test that a cancelled trial call lets the next call retry Redis."""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    # Opened long enough ago to be half-open
+    breaker.opened_at = time.monotonic() - 60
+    monkeypatch.setattr(rate_limit, "redis_breaker", breaker)
+    
+    limiter = RateLimiter(times=10, seconds=60)
+    
+    async def hang(key, cost, bucket):
+        await asyncio.Event().wait()
+    
+    monkeypatch.setattr(limiter, "_lease", hang)
+    
+    async def cancel_trial():
+        task = asyncio.create_task(limiter.acquire("rate_limit:test"))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    
+    asyncio.run(cancel_trial())
+    
+    assert breaker.state == "half_open"
+    assert breaker.allow() is True
+
+
+@pytest.mark.parametrize("algorithm", list(RateLimitAlgorithm))
+def test_redis_limit_allows_then_denies(fake_redis, breaker, algorithm):
+    """Test each Lua algorithm admits exactly the limit and reports it in headers."""
+    limiter = RateLimiter(times=5, seconds=60, algorithm=algorithm)
+    
+    results = acquire_many(limiter, 7)
+    
+    assert [r.allowed for r in results] == [True] * 5 + [False] * 2
+    assert [r.remaining for r in results[:5]] == [4, 3, 2, 1, 0]
+    # The second denial is answered from the cached first one
+    assert limiter.remote_checks == 6
+    assert breaker.state == "closed"
+    
+    allowed, denied = results[0].headers, results[-1].headers
+    assert allowed["RateLimit-Limit"] == "5"
+    assert allowed["RateLimit-Remaining"] == "4"
+    assert 0 < int(allowed["RateLimit-Reset"]) <= 60
+    assert "Retry-After" not in allowed
+    assert denied["RateLimit-Remaining"] == "0"
+    assert 0 < int(denied["Retry-After"]) <= 120
+
+
+def test_gcra_spaces_requests_evenly(fake_redis, breaker):
+    """Test GCRA asks a client at its limit to wait one emission interval."""
+    limiter = RateLimiter(times=5, seconds=60, algorithm=RateLimitAlgorithm.GCRA)
+    
+    results = acquire_many(limiter, 6)
+    
+    # One request per 60 / 5 = 12 seconds once the burst is spent
+    assert results[-1].headers["Retry-After"] == "12"
+
+
+def test_denied_cost_is_not_consumed(fake_redis, breaker):
+    """Test a request too expensive to fit doesn't use up the remaining budget."""
+    limiter = RateLimiter(times=10, seconds=60, algorithm=RateLimitAlgorithm.SLIDING_WINDOW)
+    
+    async def run():
+        expensive = await limiter.acquire("rate_limit:test", cost=20)
+        cheap = await limiter.acquire("rate_limit:test", cost=1)
+        return expensive, cheap
+    
+    expensive, cheap = asyncio.run(run())
+    
+    assert not expensive.allowed
+    assert cheap.allowed
+    assert cheap.remaining == 9
+
+
+def test_local_leases_refill_across_windows(fake_redis, breaker):
+    """Test leased units admit exactly the limit with fewer Redis calls, then refill."""
+    limiter = RateLimiter(
+        times=20, seconds=1, algorithm=RateLimitAlgorithm.FIXED_WINDOW, local_batch=10, local_ttl=1.0
+    )
+    
+    results = acquire_many(limiter, 25)
+    
+    assert sum(r.allowed for r in results) == 20
+    assert all(r.allowed for r in results[:20])
+    assert limiter.remote_checks < 20
+    
+    # The next window starts with a full budget and new leases
+    time.sleep(1.1)
+    results = acquire_many(limiter, 20)
+    assert all(r.allowed for r in results)
+
+
+def test_fallback_bucket_when_circuit_open(breaker):
+    """Test the in-process token bucket limits requests while Redis is skipped."""
+    breaker.opened_at = time.monotonic()
+    limiter = RateLimiter(times=3, seconds=60)
+    
+    results = acquire_many(limiter, 4)
+    
+    assert [r.allowed for r in results] == [True, True, True, False]
+    assert limiter.remote_checks == 0
+    # The bucket refills one unit every 60 / 3 = 20 seconds
+    assert results[-1].headers["Retry-After"] == "20"
+    assert results[-1].headers["RateLimit-Remaining"] == "0"
+
+
+def test_rate_limited_route_headers(breaker):
+    """Test responses carry RateLimit-* headers and a limited request gets 429."""
+    breaker.opened_at = time.monotonic()
+    limiter = RateLimiter(times=2, seconds=60)
+    app = FastAPI()
+    
+    @app.get("/limited", dependencies=[Depends(limiter)])
+    async def limited():
+        return {"ok": True}
+    
+    with TestClient(app) as client:
+        first = client.get("/limited")
+        client.get("/limited")
+        limited_response = client.get("/limited")
+    
+    assert first.status_code == 200
+    assert first.headers["RateLimit-Limit"] == "2"
+    assert first.headers["RateLimit-Remaining"] == "1"
+    assert limited_response.status_code == 429
+    assert limited_response.headers["Retry-After"] == "30"
@@ -0,0 +1,50 @@
+import asyncio
+import time
+
+from app.core import token_versions as token_versions_module
+from app.core.config import settings
+from app.core.token_versions import RedisTokenVersionCache
+
+
+class StalledRedis:
+    """A Redis that accepts commands but never answers."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def get(self, key):
+        self.calls += 1
+        await asyncio.Event().wait()
+
+    async def set(self, key, value, ex=None, nx=False):
+        self.calls += 1
+        await asyncio.Event().wait()
+
+
+class VersionDB:
+    """Stands in for the session; returns a fixed users.token_version."""
+
+    def __init__(self, version):
+        self.version = version
+
+    async def scalar(self, statement):
+        return self.version
+
+
+def test_stalled_redis_falls_back_to_database(monkeypatch):
+    """Test that token version checks don't hang on a stalled Redis."""
+    redis = StalledRedis()
+    monkeypatch.setattr(token_versions_module, "get_redis", lambda: redis)
+    monkeypatch.setattr(settings, "TOKEN_VERSION_REDIS_TIMEOUT", 0.01)
+    cache = RedisTokenVersionCache(ttl=30)
+    
+    async def check_versions():
+        return [await cache.get(VersionDB(3), 1) for _ in range(10)]
+    
+    started = time.monotonic()
+    assert asyncio.run(check_versions()) == [3] * 10
+    assert time.monotonic() - started < 1
+    
+    # Once the circuit opens, checks skip Redis entirely
+    assert cache.breaker.state == "open"
+    assert redis.calls == settings.TOKEN_VERSION_BREAKER_THRESHOLD